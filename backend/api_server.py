@@ -4,7 +4,9 @@ import os
 import json
 import subprocess
 import sys
+import functools
 from threading import Lock
+from operator import itemgetter
 from fastapi import FastAPI, HTTPException, Query, BackgroundTasks
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.staticfiles import StaticFiles
@@ -18,6 +20,11 @@ import time
 from fastapi.responses import FileResponse
 import tempfile
 
+try:
+    import orjson
+except ImportError:  # orjson é opcional; sem ele, usa o json da biblioteca padrão
+    orjson = None
+
 # Importando as duas funções do nosso gerador de gráfico
 from backend.chart_generator import generate_chart_image, generate_interactive_chart_html
 
@@ -102,6 +109,60 @@ ALERT_HISTORY_FILE_PATH = os.path.join(BASE_PATH, "alert_history.json")
 HISTORY_LOCK = Lock()
 CONFIG_LOCK = Lock()
 
+def _json_loads(data):
+    """Desserializa bytes/str JSON usando orjson quando disponível."""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+def _json_dumps(obj):
+    """Serializa para bytes JSON indentado, usando orjson quando disponível."""
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2)
+    return json.dumps(obj, indent=2, ensure_ascii=False).encode('utf-8')
+
+# Último config.json parseado e a (mtime, tamanho) do arquivo correspondente
+_config_cache_key = None
+_config_cache_data = None
+
+def _read_config():
+    """
+    Retorna o config.json parseado (None se o arquivo não existir ou estiver em branco).
+    O parse é reaproveitado enquanto o mtime/tamanho do arquivo não mudarem, de modo que
+    gravações feitas por outros processos continuam sendo vistas. O dict retornado é
+    compartilhado entre requisições: não deve ser alterado in-place.
+    """
+    global _config_cache_key, _config_cache_data
+    try:
+        stat = os.stat(CONFIG_FILE_PATH)
+    except FileNotFoundError:
+        return None
+    key = (stat.st_mtime_ns, stat.st_size)
+    if key != _config_cache_key:
+        with open(CONFIG_FILE_PATH, 'rb') as f:
+            content = f.read()
+        _config_cache_data = _json_loads(content) if content.strip() else None
+        _config_cache_key = key
+    return _config_cache_data
+
+def _write_config(config):
+    """Grava o config.json e já deixa o dict gravado como cache, evitando reparsear o próprio arquivo."""
+    global _config_cache_key, _config_cache_data
+    _config_cache_key = None
+    # Grava em um arquivo temporário e troca de forma atômica: uma escrita interrompida nunca
+    # deixa um config.json truncado para o monitor ou para a próxima requisição.
+    tmp_path = CONFIG_FILE_PATH + ".tmp"
+    with open(tmp_path, 'wb') as f:
+        f.write(_json_dumps(config))
+    os.replace(tmp_path, CONFIG_FILE_PATH)
+    stat = os.stat(CONFIG_FILE_PATH)
+    _config_cache_key = (stat.st_mtime_ns, stat.st_size)
+    _config_cache_data = config
+
+def _empty_config():
+    """Estrutura mínima devolvida/gravada quando ainda não há config.json."""
+    return {"cryptos_to_monitor": [], "market_analysis_config": {}}
+
 
 # --- Backtesting Components ---
 from backend.backtester import MovingAverageCrossoverStrategy
@@ -288,21 +349,15 @@ async def get_all_tradable_coins():
         if not binance_symbols:
             raise HTTPException(status_code=503, detail="Could not fetch symbol list from Binance.")
         tradable_base_assets = {s.replace('USDT', '') for s in binance_symbols}
-        all_coingecko_coins = coin_manager_instance.get_all_coins()
+        # A lista já vem ordenada por nome (ordenada uma vez por carga), então o filtro preserva a ordem
+        all_coingecko_coins = coin_manager_instance.get_coins_sorted_by_name()
         if not all_coingecko_coins:
             raise HTTPException(status_code=500, detail="Failed to fetch coin list from CoinManager.")
-        filtered_coins = [
-            {
-                "id": coin['id'],
-                "symbol": coin['symbol'].upper(),
-                "name": coin['name']
-            }
-            for coin in all_coingecko_coins
-            if coin['symbol'].upper() in tradable_base_assets
-        ]
-        sorted_filtered_coins = sorted(filtered_coins, key=lambda x: x['name'])
-        logging.info(f"Returning {len(sorted_filtered_coins)} tradable coins.")
-        return sorted_filtered_coins
+        # O CoinManager já guarda só id/symbol/name, com o símbolo em maiúsculas:
+        # os registros são devolvidos como estão, sem .upper() nem cópia por moeda
+        filtered_coins = [coin for coin in all_coingecko_coins if coin['symbol'] in tradable_base_assets]
+        logging.info(f"Returning {len(filtered_coins)} tradable coins.")
+        return filtered_coins
     except Exception as e:
         logging.error(f"Error fetching all tradable coins: {e}")
         raise HTTPException(status_code=500, detail=str(e))
@@ -339,22 +394,17 @@ async def get_alert_configs():
     Returns the contents of the monitoring configuration file.
     """
     try:
-        if not os.path.exists(CONFIG_FILE_PATH):
-            logging.warning("config.json not found.")
-            return {"cryptos_to_monitor": [], "market_analysis_config": {}}
-
-        with open(CONFIG_FILE_PATH, 'r', encoding='utf-8') as f:
-            try:
-                content = f.read()
-                if not content.strip():
-                    logging.warning("config.json is empty.")
-                    return {"cryptos_to_monitor": [], "market_analysis_config": {}}
-
-                config_data = json.loads(content)
-                return config_data
-            except json.JSONDecodeError:
-                logging.error("Failed to decode config.json.")
-                raise HTTPException(status_code=500, detail="Failed to parse configuration file.")
+        try:
+            config_data = _read_config()
+        except json.JSONDecodeError:
+            logging.error("Failed to decode config.json.")
+            raise HTTPException(status_code=500, detail="Failed to parse configuration file.")
+
+        if config_data is None:
+            # Arquivo ausente ou em branco; um {} válido é devolvido como está
+            logging.warning("config.json not found or empty.")
+            return _empty_config()
+        return config_data
     except Exception as e:
         logging.error(f"Error reading configuration file: {e}", exc_info=True)
         raise HTTPException(status_code=500, detail=f"An internal server error occurred while reading config: {str(e)}")
@@ -369,8 +419,7 @@ async def save_alert_configs(config_data: Dict[str, Any]):
             raise HTTPException(status_code=400, detail="Invalid configuration structure.")
 
         with CONFIG_LOCK:
-            with open(CONFIG_FILE_PATH, 'w', encoding='utf-8') as f:
-                json.dump(config_data, f, indent=4)
+            _write_config(config_data)
         logging.info("Successfully saved configuration to config.json")
         return {"message": "Configuration saved successfully."}
     except HTTPException:
@@ -382,6 +431,17 @@ async def save_alert_configs(config_data: Dict[str, Any]):
 class CoinAddRequest(BaseModel):
     symbol: str
 
+# Condições habilitadas por padrão para uma moeda recém-adicionada ao monitoramento
+_DEFAULT_ALERT_CONDITION_KEYS = (
+    "rsi_sobrevendido",
+    "rsi_sobrecomprado",
+    "hilo_compra",
+    "mme_cruz_dourada",
+    "mme_cruz_morte",
+    "macd_cruz_alta",
+    "macd_cruz_baixa",
+)
+
 @app.post("/api/monitored_coins")
 async def add_monitored_coin(request: CoinAddRequest):
     """
@@ -389,36 +449,24 @@ async def add_monitored_coin(request: CoinAddRequest):
     """
     with CONFIG_LOCK:
         try:
-            config = {"cryptos_to_monitor": [], "market_analysis_config": {}}
-            if os.path.exists(CONFIG_FILE_PATH):
-                with open(CONFIG_FILE_PATH, 'r', encoding='utf-8') as f:
-                    content = f.read()
-                    if content:
-                        config = json.loads(content)
+            # Cópia rasa: o dict em cache não é alterado antes da gravação
+            config = dict(_read_config() or _empty_config())
 
-            monitored_symbols = [c['symbol'] for c in config['cryptos_to_monitor']]
-            if request.symbol in monitored_symbols:
+            # Verificação direta, com parada no primeiro acerto, sem montar uma lista de símbolos
+            if any(c.get('symbol') == request.symbol for c in config['cryptos_to_monitor']):
                 logging.warning(f"Attempted to add existing coin {request.symbol}. No action taken.")
                 return {"message": f"Coin {request.symbol} is already monitored."}
 
             new_coin_config = {
                 "symbol": request.symbol,
                 "alert_config": {
-                    "conditions": {
-                        "rsi_sobrevendido": {"enabled": True, "blinking": True},
-                        "rsi_sobrecomprado": {"enabled": True, "blinking": True},
-                        "hilo_compra": {"enabled": True, "blinking": True},
-                        "mme_cruz_dourada": {"enabled": True, "blinking": True},
-                        "mme_cruz_morte": {"enabled": True, "blinking": True},
-                        "macd_cruz_alta": {"enabled": True, "blinking": True},
-                        "macd_cruz_baixa": {"enabled": True, "blinking": True},
-                    }
+                    # Cada moeda recebe seus próprios dicts, pois as condições são editadas individualmente
+                    "conditions": {key: {"enabled": True, "blinking": True} for key in _DEFAULT_ALERT_CONDITION_KEYS}
                 }
             }
-            config['cryptos_to_monitor'].append(new_coin_config)
+            config['cryptos_to_monitor'] = [*config['cryptos_to_monitor'], new_coin_config]
 
-            with open(CONFIG_FILE_PATH, 'w', encoding='utf-8') as f:
-                json.dump(config, f, indent=4)
+            _write_config(config)
 
             logging.info(f"Successfully added {request.symbol} to monitored coins.")
             return {"message": f"Coin {request.symbol} added successfully."}
@@ -434,11 +482,10 @@ async def remove_monitored_coin(symbol: str):
     """
     with CONFIG_LOCK:
         try:
-            if not os.path.exists(CONFIG_FILE_PATH):
+            cached_config = _read_config()
+            if cached_config is None:
                 raise HTTPException(status_code=404, detail="Configuration file not found.")
-
-            with open(CONFIG_FILE_PATH, 'r', encoding='utf-8') as f:
-                config = json.load(f)
+            config = dict(cached_config)
 
             initial_count = len(config['cryptos_to_monitor'])
             config['cryptos_to_monitor'] = [
@@ -449,8 +496,7 @@ async def remove_monitored_coin(symbol: str):
                 logging.warning(f"Attempted to remove non-existent coin {symbol}.")
                 raise HTTPException(status_code=404, detail=f"Coin {symbol} not found in monitored list.")
 
-            with open(CONFIG_FILE_PATH, 'w', encoding='utf-8') as f:
-                json.dump(config, f, indent=4)
+            _write_config(config)
 
             logging.info(f"Successfully removed {symbol} from monitored coins.")
             return {"message": f"Coin {symbol} removed successfully."}
@@ -470,6 +516,11 @@ class Alert(BaseModel):
     timestamp: str
     snapshot: Dict[str, Any]
 
+@functools.lru_cache(maxsize=4096)
+def _parse_alert_timestamp(timestamp):
+    """Converte o timestamp ISO de um alerta, memorizando o resultado (o histórico é relido a cada filtro)."""
+    return datetime.fromisoformat(timestamp)
+
 @app.get("/api/alerts", response_model=List[Alert])
 async def get_alert_history(start_date: Optional[str] = Query(None, description="Start date for filtering (YYYY-MM-DD)"), end_date: Optional[str] = Query(None, description="End date for filtering (YYYY-MM-DD)")):
     try:
@@ -487,7 +538,8 @@ async def get_alert_history(start_date: Optional[str] = Query(None, description=
                 try:
                     start_dt = datetime.fromisoformat(start_date + "T00:00:00")
                     end_dt = datetime.fromisoformat(end_date + "T23:59:59")
-                    filtered_history = [alert for alert in history if start_dt <= datetime.fromisoformat(alert['timestamp']) <= end_dt]
+                    parse_timestamp = _parse_alert_timestamp # nome local: evita a busca global a cada alerta
+                    filtered_history = [alert for alert in history if start_dt <= parse_timestamp(alert['timestamp']) <= end_dt]
                     return filtered_history
                 except (ValueError, TypeError) as e:
                     logging.error(f"Invalid date format provided: {e}")
@@ -541,12 +593,11 @@ async def get_telegram_config():
     Returns the Telegram configuration.
     """
     try:
-        if not os.path.exists(CONFIG_FILE_PATH):
+        config_data = _read_config()
+        if config_data is None:
             return {"bot_token": "", "chat_id": ""}
-        with open(CONFIG_FILE_PATH, 'r', encoding='utf-8') as f:
-            config_data = json.load(f)
-            telegram_config = config_data.get("telegram_config", {"bot_token": "", "chat_id": ""})
-            return telegram_config
+        telegram_config = config_data.get("telegram_config", {"bot_token": "", "chat_id": ""})
+        return telegram_config
     except Exception as e:
         logging.error(f"Error reading Telegram configuration: {e}")
         raise HTTPException(status_code=500, detail="Failed to read Telegram configuration.")
@@ -558,17 +609,10 @@ async def save_telegram_config(telegram_config: TelegramConfigRequest):
     """
     with CONFIG_LOCK:
         try:
-            config = {}
-            if os.path.exists(CONFIG_FILE_PATH):
-                with open(CONFIG_FILE_PATH, 'r', encoding='utf-8') as f:
-                    content = f.read()
-                    if content:
-                        config = json.loads(content)
-
+            config = dict(_read_config() or {})
             config["telegram_config"] = telegram_config.model_dump()
 
-            with open(CONFIG_FILE_PATH, 'w', encoding='utf-8') as f:
-                json.dump(config, f, indent=4)
+            _write_config(config)
 
             logging.info("Successfully saved Telegram configuration.")
             return {"message": "Telegram configuration saved successfully."}
@@ -584,15 +628,10 @@ async def test_telegram_endpoint():
     """
     try:
         with CONFIG_LOCK:
-            if not os.path.exists(CONFIG_FILE_PATH):
+            config = _read_config()
+            if config is None:
                 raise HTTPException(status_code=404, detail="Arquivo de configuração não encontrado.")
 
-            config = {}
-            with open(CONFIG_FILE_PATH, 'r', encoding='utf-8') as f:
-                content = f.read()
-                if content:
-                    config = json.loads(content)
-
         telegram_config = config.get("telegram_config", {})
         bot_token = telegram_config.get("bot_token")
         chat_id = telegram_config.get("chat_id")
@@ -648,7 +687,7 @@ async def get_coin_details(symbol: str):
                                 if alert.get('symbol') == symbol and
                                 pd.to_datetime(alert.get('timestamp')).tz_convert('UTC') >= start_date_alerts
                             ]
-                            recent_alerts = sorted(symbol_alerts, key=lambda x: x['timestamp'], reverse=True)
+                            recent_alerts = sorted(symbol_alerts, key=itemgetter('timestamp'), reverse=True)
                     except (json.JSONDecodeError, IndexError, TypeError):
                         pass
 
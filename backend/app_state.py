@@ -3,9 +3,12 @@ import os
 import sys
 import time
 import logging
+import functools
 
+@functools.lru_cache(maxsize=None)
 def get_application_path():
-    """Retorna o caminho do diretório da aplicação, compatível com PyInstaller."""
+    """Retorna o caminho do diretório da aplicação, compatível com PyInstaller.
+    O valor não muda durante a execução, então é calculado uma única vez."""
     if getattr(sys, 'frozen', False):
         return os.path.dirname(sys.executable)
     return os.path.dirname(os.path.abspath(__file__))
@@ -1,6 +1,5 @@
 import pandas as pd
 import logging
-import time
 import numpy as np
 from .indicators import calculate_sma, calculate_hma, calculate_vwap
 
@@ -198,11 +197,12 @@ def run_backtest(historical_df, symbol, stop_event, pause_event, queue_put):
     df, signals = backtester.run(symbol)
 
     for signal in signals:
+        # Enquanto pausado, espera no stop_event: a interrupção é atendida na hora, sem aguardar o fim de um sleep
+        while pause_event.is_set() and not stop_event.wait(1):
+            pass
         if stop_event.is_set():
             queue_put("INFO: Backtest stopped by user.")
             break
-        while pause_event.is_set():
-            time.sleep(1)
         queue_put(f"{signal['timestamp']} - {signal['message']}")
 
     queue_put("INFO: Backtest finished.")
@@ -1,30 +1,54 @@
 # capital_flow.py (VERSÃO FINAL E FUNCIONAL)
 
+import numpy as np
 import pandas as pd
-from robust_services import DataCache, BinanceRateLimiter
+from robust_services import DataCache, BinanceRateLimiter, coingecko_rate_limiter, get_coingecko_client
 from pycoingecko import CoinGeckoAPI
 import time
 
 def get_categories_data(cg_client, data_cache, rate_limiter):
     """
     Busca a lista de todas as categorias da CoinGecko com dados detalhados.
+    Retorna um DataFrame já construído (com 'rank'); o próprio DataFrame fica em cache,
+    evitando refazer a conversão JSON -> pandas a cada nova análise.
+    Se cg_client for None, usa o cliente CoinGecko da thread atual.
     """
-    cache_key = {'method': 'get_coins_categories'}
-    categories_data = data_cache.get(cache_key, ttl=3600) # Cache de 1 hora
-    if categories_data:
+    cache_key = {'method': 'get_coins_categories', 'format': 'dataframe'}
+    categories_df = data_cache.get(cache_key, ttl=3600) # Cache de 1 hora
+    if categories_df is not None:
         print("Dados de categorias obtidos do cache.")
-        return categories_data
+        return categories_df
 
     print("Buscando novas categorias da API...")
+    # O token bucket espaça as chamadas à CoinGecko antes de atingir o limite (evitando
+    # as penalidades de 429); o rate limiter injetado continua contabilizando o uso geral.
+    coingecko_rate_limiter.wait_if_needed()
     rate_limiter.wait_if_needed()
+    if cg_client is None:
+        cg_client = get_coingecko_client()
     try:
         categories_data = cg_client.get_coins_categories()
-        data_cache.set(cache_key, categories_data)
-        return categories_data
+        categories_df = pd.DataFrame(categories_data)
+        # Adiciona o 'rank' para manter a ordem da API (que é por market cap)
+        if 'rank' not in categories_df.columns:
+            categories_df['rank'] = range(1, len(categories_df) + 1)
+        data_cache.set(cache_key, categories_df)
+        return categories_df
     except Exception as e:
         print(f"Erro ao buscar categorias: {e}")
         return None
 
+def _format_usd_scale(values):
+    """
+    Formata uma Series de valores em dólares como '$X.XXB' ou '$X.XXM' de forma vetorizada.
+    """
+    amounts = values.to_numpy(dtype=float)
+    is_billion = amounts >= 1_000_000_000
+    scaled = np.where(is_billion, amounts / 1_000_000_000, amounts / 1_000_000)
+    suffix = np.where(is_billion, 'B', 'M')
+    formatted = np.char.add(np.char.add('$', np.char.mod('%.2f', scaled)), suffix)
+    return pd.Series(formatted, index=values.index)
+
 def analyze_capital_flow(categories_df, config):
     """
     Analisa e agrega o fluxo de capital por categoria.
@@ -45,33 +69,34 @@ def analyze_capital_flow(categories_df, config):
     categories_df = categories_df[categories_df['market_cap'].notna()]
     filtered_categories = categories_df[categories_df['market_cap'] >= min_market_cap]
 
-    # Ordena as categorias pelo market cap e pega as Top N
-    top_categories = filtered_categories.nlargest(top_n, 'market_cap').copy()
+    # Mantém apenas as colunas usadas na exibição antes de ordenar (a API retorna
+    # listas de imagens e outros campos que não precisam ser copiados)
+    display_cols = [col for col in ('rank', 'name', 'market_cap', 'volume_24h') if col in filtered_categories.columns]
+    slim_categories = filtered_categories[display_cols]
+
+    # Ordena as categorias pelo market cap e pega as Top N (nlargest já retorna um novo DataFrame)
+    top_categories = slim_categories.nlargest(top_n, 'market_cap')
 
     if top_categories.empty:
         return pd.DataFrame()
 
     # Formata os números para melhor leitura
-    top_categories['market_cap_formatted'] = top_categories['market_cap'].apply(lambda x: f"${x/1_000_000_000:.2f}B" if x >= 1_000_000_000 else f"${x/1_000_000:.2f}M")
-    top_categories['volume_24h_formatted'] = top_categories['volume_24h'].apply(lambda x: f"${x/1_000_000_000:.2f}B" if x >= 1_000_000_000 else f"${x/1_000_000:.2f}M")
+    top_categories['market_cap_formatted'] = _format_usd_scale(top_categories['market_cap'])
+    top_categories['volume_24h_formatted'] = _format_usd_scale(top_categories['volume_24h'])
 
     return top_categories
 
-def print_results(results_df):
+def format_results(results_df):
     """
-    Imprime os resultados da análise de forma formatada.
+    Monta o relatório da análise como texto, pronto para ser exibido em console ou GUI.
     """
     if results_df.empty:
-        print("\nNenhuma categoria atendeu aos critérios para exibição.")
-        return
-
-    print("\n--- Análise de Fluxo de Capital por Categoria (Top N) ---")
-    print("-" * 80)
+        return "\nNenhuma categoria atendeu aos critérios para exibição."
 
+    separator = "-" * 80
     # MUDANÇA: Cabeçalho sem a coluna "Variação (24h)"
     header = f"{'Rank':<5} {'Categoria':<35} {'Market Cap':>20} {'Volume (24h)':>20}"
-    print(header)
-    print("-" * 80)
+    lines = ["\n--- Análise de Fluxo de Capital por Categoria (Top N) ---", separator, header, separator]
 
     for index, row in results_df.iterrows():
         rank = row.get('rank', 'N/A')
@@ -80,33 +105,34 @@ def print_results(results_df):
         vol_formatted = row.get('volume_24h_formatted', 'N/A')
 
         # MUDANÇA: Linha sem a coluna de variação e com espaçamento ajustado
-        line = (f"{rank:<5} {name:<35} "
-                f"{mcap_formatted:>20} "
-                f"{vol_formatted:>20}")
-        print(line)
+        lines.append(f"{rank:<5} {name:<35} "
+                     f"{mcap_formatted:>20} "
+                     f"{vol_formatted:>20}")
 
-    print("-" * 80)
-    print("\nAnálise concluída.")
+    lines.append(separator)
+    lines.append("\nAnálise concluída.")
+    return "\n".join(lines)
+
+def print_results(results_df):
+    """
+    Imprime os resultados da análise de forma formatada.
+    """
+    print(format_results(results_df))
 
 def run_full_analysis(config, cg_client: CoinGeckoAPI, data_cache_instance: DataCache, rate_limiter_instance: BinanceRateLimiter):
     """
     Função principal que orquestra todo o processo de análise de fluxo de capital.
+    Retorna o relatório formatado como texto, sem depender de captura do sys.stdout.
     """
     start_time = time.time()
 
-    categories_data = get_categories_data(cg_client, data_cache_instance, rate_limiter_instance)
-    if categories_data is None:
-        print("Não foi possível obter os dados das categorias. Abortando análise.")
-        return
-
-    categories_df = pd.DataFrame(categories_data)
-    # Adiciona o 'rank' para manter a ordem da API (que é por market cap)
-    if 'rank' not in categories_df.columns:
-      categories_df['rank'] = range(1, len(categories_df) + 1)
+    categories_df = get_categories_data(cg_client, data_cache_instance, rate_limiter_instance)
+    if categories_df is None:
+        return "Não foi possível obter os dados das categorias. Abortando análise."
 
     analysis_results = analyze_capital_flow(categories_df, config)
 
-    print_results(analysis_results)
+    report = format_results(analysis_results)
 
     end_time = time.time()
-    print(f"\nTempo total da análise: {end_time - start_time:.2f} segundos.")
\ No newline at end of file
+    return f"{report}\n\nTempo total da análise: {end_time - start_time:.2f} segundos."
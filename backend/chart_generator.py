@@ -1,7 +1,11 @@
 import plotly.graph_objects as go
+import numpy as np
 import pandas as pd
 import plotly.io as pio
 
+# Palavras que identificam um alerta de venda/baixa (marcador apontando para baixo)
+_SELL_PATTERN = 'venda|baixa'
+
 def _create_figure(df, alerts, symbol):
     """Função auxiliar para criar a figura base do gráfico, evitando duplicação de código."""
     if df.empty:
@@ -9,41 +13,46 @@ def _create_figure(df, alerts, symbol):
         fig.update_layout(title_text="Sem dados para exibir")
         return fig
 
-    fig = go.Figure(data=[go.Candlestick(x=df.index,
-                                           open=df['open'],
-                                           high=df['high'],
-                                           low=df['low'],
-                                           close=df['close'],
+    # Arrays NumPy vão direto para o validador do Plotly, sem o tratamento de índice das Series
+    fig = go.Figure(data=[go.Candlestick(x=df.index.to_numpy(),
+                                           open=df['open'].to_numpy(),
+                                           high=df['high'].to_numpy(),
+                                           low=df['low'].to_numpy(),
+                                           close=df['close'].to_numpy(),
                                            name='Preço')])
 
-    alerts.sort(key=lambda a: a['timestamp'])
-    last_x_pos = None
-    last_y_offset = -40
+    if alerts:
+        # Classifica e posiciona todos os alertas de forma vetorizada, em vez de
+        # testar substrings e calcular deslocamentos alerta por alerta.
+        alerts_df = pd.DataFrame(alerts, columns=['timestamp', 'price', 'message']).sort_values('timestamp', kind='stable')
+        is_sell = alerts_df['message'].str.contains(_SELL_PATTERN, case=False, regex=True).to_numpy()
+        marker_symbols = np.where(is_sell, 'triangle-down', 'triangle-up')
+
+        # Alertas a menos de 6h do anterior são escalonados para não sobrepor o texto
+        close_to_previous = (alerts_df['timestamp'].diff() < pd.Timedelta(hours=6)).to_numpy()
+        ay_offsets = []
+        last_y_offset = -40
+        for is_close in close_to_previous:
+            ay_offset = (last_y_offset - 30 if last_y_offset < -40 else -70) if is_close else -40
+            ay_offsets.append(ay_offset)
+            last_y_offset = ay_offset
+
+        annotations = [
+            dict(
+                x=x_pos, y=price, text=message, showarrow=True, arrowhead=1,
+                ax=0, ay=ay_offset, bgcolor="rgba(255, 255, 255, 0.7)",
+                font=dict(family="sans-serif", size=12, color="#000000"),
+                align="center", bordercolor="#c7c7c7", borderwidth=2, borderpad=4,
+            )
+            for x_pos, price, message, ay_offset in zip(alerts_df['timestamp'], alerts_df['price'], alerts_df['message'], ay_offsets)
+        ]
 
-    for alert in alerts:
-        current_x_pos = alert['timestamp']
-        ay_offset = -40
-        if last_x_pos is not None:
-            time_difference = pd.to_timedelta(current_x_pos - last_x_pos).total_seconds()
-            if time_difference < 6 * 3600:
-                ay_offset = last_y_offset - 30 if last_y_offset < -40 else -70
-        
-        fig.add_annotation(
-            x=current_x_pos, y=alert['price'], text=alert['message'], showarrow=True, arrowhead=1,
-            ax=0, ay=ay_offset, bgcolor="rgba(255, 255, 255, 0.7)",
-            font=dict(family="sans-serif", size=12, color="#000000"),
-            align="center", bordercolor="#c7c7c7", borderwidth=2, borderpad=4,
-        )
-        fig.add_trace(go.Scatter(
-            x=[current_x_pos], y=[alert['price']], mode='markers',
-            marker=dict(
-                color='red', size=10,
-                symbol='triangle-down' if 'venda' in alert['message'].lower() or 'baixa' in alert['message'].lower() else 'triangle-up'
-            ),
+        fig.add_traces([go.Scatter(
+            x=alerts_df['timestamp'].to_numpy(), y=alerts_df['price'].to_numpy(), mode='markers',
+            marker=dict(color='red', size=10, symbol=marker_symbols),
             showlegend=False
-        ))
-        last_x_pos = current_x_pos
-        last_y_offset = ay_offset
+        )])
+        fig.update_layout(annotations=annotations)
 
     title_symbol = symbol if symbol else ''
     fig.update_layout(
@@ -61,6 +70,27 @@ def generate_chart_image(df, alerts, output_path, symbol=None):
     fig.write_image(output_path, width=3840, height=2160, scale=2)
     print(f"Gráfico de ultra alta resolução salvo em: {output_path}")
 
+def generate_chart(df, alerts, *, mode='show', output_path=None, symbol=None):
+    """
+    Ponto de entrada único do gerador de gráficos; todos os modos usam _create_figure.
+    mode: 'show' abre no navegador, 'json' retorna o JSON da figura,
+    'image' salva um PNG em output_path e 'html' salva um HTML interativo em output_path.
+    """
+    if mode in ('image', 'html'):
+        if not output_path:
+            raise ValueError(f"output_path é obrigatório para o modo '{mode}'.")
+        if mode == 'image':
+            return generate_chart_image(df, alerts, output_path, symbol=symbol)
+        return generate_interactive_chart_html(df, alerts, output_path, symbol=symbol)
+
+    fig = _create_figure(df, alerts, symbol)
+    if mode == 'json':
+        return fig.to_json()
+    if mode == 'show':
+        fig.show()
+        return None
+    raise ValueError(f"Modo de gráfico desconhecido: {mode}")
+
 def generate_interactive_chart_html(df, alerts, output_path, symbol=None):
     """Gera um gráfico e o salva como um arquivo HTML interativo."""
     fig = _create_figure(df, alerts, symbol)
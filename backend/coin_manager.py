@@ -1,37 +1,194 @@
 import os
+import sys
 import json
+import pickle
 import time
+import threading
 import logging
-from datetime import datetime, timedelta
-from pycoingecko import CoinGeckoAPI
+from operator import itemgetter
+from datetime import timedelta
+import requests
 from .app_state import get_application_path
 
+try:
+    import orjson
+except ImportError:  # orjson é opcional; sem ele, usa o json da biblioteca padrão
+    orjson = None
+
+def _json_loads(data):
+    """Desserializa bytes/str JSON usando orjson quando disponível."""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+COINGECKO_COINS_LIST_URL = "https://api.coingecko.com/api/v3/coins/list"
+# Intervalo mínimo entre novas tentativas depois de uma carga que falhou (ex.: offline)
+LOAD_RETRY_INTERVAL_SEC = 300
+
+def _project_coin_fields(coins):
+    """Mantém apenas os campos usados pela aplicação (id, symbol, name), com o símbolo já em maiúsculas."""
+    # id e symbol são internados: viram chaves de dicionários em toda a aplicação
+    intern = sys.intern
+    return [{'id': intern(c['id']), 'symbol': intern(c['symbol'].upper()), 'name': c['name']} for c in coins]
+
+def _intern_coin_keys(coins):
+    """Interna id/symbol de uma lista já projetada (o pickle não preserva o internamento)."""
+    intern = sys.intern
+    for c in coins:
+        c['id'] = intern(c['id'])
+        c['symbol'] = intern(c['symbol'])
+    return coins
+
 class CoinManager:
     def __init__(self, update_interval_hours=24):
-        self.coin_list_path = os.path.join(get_application_path(), "all_coins.json")
+        self.coin_list_path = os.path.join(get_application_path(), "all_coins.pkl")
+        # Cache JSON das versões anteriores; lido apenas se o cache binário ainda não existir
+        self.legacy_coin_list_path = os.path.join(get_application_path(), "all_coins.json")
+        # ETag da última resposta da CoinGecko, usado para revalidar o cache com GET condicional
+        self.etag_path = os.path.join(get_application_path(), "all_coins.etag")
         self.update_interval = timedelta(hours=update_interval_hours)
-        self.cg = CoinGeckoAPI()
-        self.all_coins = self._load_or_fetch_coins()
+        self._update_interval_sec = self.update_interval.total_seconds()
+        # Lista de exibição ordenada e mapa exibição -> símbolo, reconstruídos só quando all_coins muda
+        self._display_cache = None
+        self._symbol_by_display = {}
+        self._sorted_by_name = None
+        self._refresh_thread = None
+        # Carregada sob demanda no primeiro acesso a all_coins (ver propriedade abaixo)
+        self._all_coins = None
+        # Momento da última carga que falhou; evita refazer a requisição a cada acesso
+        self._load_failed_at = None
+
+    @property
+    def all_coins(self):
+        """The coin list, loaded from cache (or fetched) on first access."""
+        if self._all_coins is None:
+            return self._load_coins()
+        return self._all_coins
+
+    @all_coins.setter
+    def all_coins(self, coins):
+        self._all_coins = coins
+        self._display_cache = None
+        self._symbol_by_display = {}
+        self._sorted_by_name = None
+
+    def _load_coins(self):
+        """Loads (or fetches) the coin list, backing off for a while after a failed attempt."""
+        if self._load_failed_at is not None and time.time() - self._load_failed_at < LOAD_RETRY_INTERVAL_SEC:
+            return None
+        coins = self._load_or_fetch_coins()
+        if coins is None:
+            self._load_failed_at = time.time()
+            return None
+        self._load_failed_at = None
+        self.all_coins = coins
+        return coins
 
-    def _fetch_coins_from_api(self):
-        """Fetches the complete list of coins from the CoinGecko API."""
+    def _fetch_coins_from_api(self, cached_coins=None):
+        """
+        Fetches the complete list of coins from the CoinGecko API.
+        When cached_coins is given, the request is conditional and a 304 returns that list.
+        """
         logging.info("Fetching coin list from CoinGecko API...")
+        headers = {}
+        # Só revalida quando há uma lista em memória para reaproveitar em caso de 304
+        etag = self._read_etag() if cached_coins else None
+        if etag:
+            headers['If-None-Match'] = etag
         try:
-            coins = self.cg.get_coins_list()
-            with open(self.coin_list_path, 'w', encoding='utf-8') as f:
-                json.dump(coins, f, indent=2)
+            response = requests.get(COINGECKO_COINS_LIST_URL, headers=headers, timeout=30)
+            if response.status_code == 304:
+                # Lista inalterada: apenas renova o mtime para reiniciar o intervalo de atualização
+                os.utime(self.coin_list_path, None)
+                logging.info("Coin list unchanged upstream (304). Cache timestamp refreshed.")
+                return cached_coins
+            response.raise_for_status()
+            coins = _project_coin_fields(_json_loads(response.content))
+            self._save_coins(coins)
+            self._write_etag(response.headers.get('ETag'))
             logging.info(f"Successfully fetched and saved {len(coins)} coins.")
             return coins
         except Exception as e:
             logging.error(f"Failed to fetch coin list from CoinGecko: {e}")
             return None
 
+    def _save_coins(self, coins):
+        """Persists the coin list in pickle format (no tokenization needed on load)."""
+        # O arquivo é gerado e lido só pela própria aplicação, então um formato binário
+        # nativo é suficiente e evita o parse de vários MB de JSON a cada inicialização.
+        # Grava em um arquivo temporário e troca de forma atômica, para que uma escrita
+        # interrompida nunca deixe o cache corrompido.
+        tmp_path = self.coin_list_path + ".tmp"
+        with open(tmp_path, 'wb') as f:
+            pickle.dump(coins, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_path, self.coin_list_path)
+
+    def _read_etag(self):
+        """Returns the ETag stored alongside the cache, or None."""
+        try:
+            with open(self.etag_path, 'r', encoding='utf-8') as f:
+                return f.read().strip() or None
+        except OSError:
+            return None
+
+    def _write_etag(self, etag):
+        """Stores (or clears) the ETag of the last full coin list download."""
+        try:
+            if etag:
+                with open(self.etag_path, 'w', encoding='utf-8') as f:
+                    f.write(etag)
+            elif os.path.exists(self.etag_path):
+                os.remove(self.etag_path)
+        except OSError as e:
+            logging.warning(f"Could not update coin list ETag: {e}")
+
+    def _refresh_in_background(self, cached_coins):
+        """Fetches a fresh coin list and swaps it in, keeping the cached one on failure or 304."""
+        coins = self._fetch_coins_from_api(cached_coins)
+        if coins and coins is not cached_coins:
+            self.all_coins = coins
+
+    def _schedule_refresh_if_stale(self, mtime, cached_coins):
+        """Starts a background refresh when the cache file (mtime) is older than update_interval."""
+        if self._refresh_thread is not None and self._refresh_thread.is_alive():
+            return
+        if time.time() - mtime < self._update_interval_sec:
+            return
+        logging.info("Coin list cache is stale. Refreshing in background...")
+        # A lista recém-carregada é passada adiante: a propriedade ainda não a armazenou em
+        # _all_coins, e é ela que permite o GET condicional (If-None-Match) e o reuso no 304
+        self._refresh_thread = threading.Thread(target=self._refresh_in_background, args=(cached_coins,), daemon=True)
+        self._refresh_thread.start()
+
     def _load_or_fetch_coins(self):
-        """Loads the coin list from the local cache, or fetches it once if it doesn't exist."""
-        if os.path.exists(self.coin_list_path):
-            logging.info("Loading coin list from local cache (updates disabled).")
-            with open(self.coin_list_path, 'r', encoding='utf-8') as f:
-                return json.load(f)
+        """Loads the coin list from the local cache, or fetches it if no cache exists."""
+        # Abre direto e usa fstat no handle já aberto: um único acesso ao sistema de
+        # arquivos no caminho comum, em vez de exists() + getmtime() separados.
+        try:
+            with open(self.coin_list_path, 'rb') as f:
+                mtime = os.fstat(f.fileno()).st_mtime
+                coins = _intern_coin_keys(pickle.load(f))
+            logging.info("Loaded coin list from local cache.")
+            # Serve o cache imediatamente; se estiver velho, atualiza em segundo plano
+            self._schedule_refresh_if_stale(mtime, coins)
+            return coins
+        except FileNotFoundError:
+            pass
+        except Exception as e:
+            logging.warning(f"Failed to read coin cache {self.coin_list_path}: {e}")
+
+        try:
+            with open(self.legacy_coin_list_path, 'rb') as f:
+                coins = _project_coin_fields(_json_loads(f.read()))
+        except FileNotFoundError:
+            coins = None
+        if coins is not None:
+            logging.info("Migrated coin list from legacy JSON cache.")
+            try:
+                self._save_coins(coins)
+            except OSError as e:
+                logging.warning(f"Could not write binary coin cache: {e}")
+            return coins
 
         return self._fetch_coins_from_api()
 
@@ -40,24 +197,51 @@ class CoinManager:
         Returns the list of all coins.
         If the list is not available, it attempts to load or fetch it again.
         """
-        if not self.all_coins:
-            logging.warning("Coin list is not loaded. Attempting to reload...")
-            self.all_coins = self._load_or_fetch_coins()
-        return self.all_coins
+        coins = self._all_coins
+        if not coins:
+            logging.warning("Coin list is not loaded. Attempting to load...")
+            coins = self._load_coins()
+        return coins
+
+    def get_coins_sorted_by_name(self):
+        """Returns the coin list sorted by name, sorted once per (re)load of all_coins."""
+        if self._sorted_by_name is None:
+            coins = self.all_coins
+            if not coins:
+                return []
+            self._sorted_by_name = sorted(coins, key=itemgetter('name'))
+        return self._sorted_by_name
 
     def get_coin_display_list(self):
         """Returns a list of formatted strings for display (e.g., 'Bitcoin (BTC)')."""
         if not self.all_coins:
             return []
+        if self._display_cache is not None:
+            return self._display_cache
 
-        # Sort by name for user-friendly display
-        sorted_coins = sorted(self.all_coins, key=lambda x: x['name'])
+        # Colunas paralelas: ordena só os índices pelo nome, sem tocar nos dicts a cada comparação
+        names = [coin['name'] for coin in self.all_coins]
+        symbols = [coin['symbol'] for coin in self.all_coins]
+        order = sorted(range(len(names)), key=names.__getitem__)
 
-        return [f"{coin['name']} ({coin['symbol'].upper()})" for coin in sorted_coins]
+        display_list = [f"{names[i]} ({symbols[i]})" for i in order]
+        self._symbol_by_display = dict(zip(display_list, (symbols[i] for i in order)))
+        self._display_cache = display_list
+        return display_list
 
     def get_symbol_from_display_name(self, display_name):
         """Extracts the symbol from the display name format."""
-        try:
-            return display_name.split('(')[-1].replace(')', '').strip()
-        except:
+        if not isinstance(display_name, str):
+            return None
+        symbol = self._symbol_by_display.get(display_name)
+        if symbol is not None:
+            return symbol
+        return self._parse_symbol_from_display_name(display_name)
+
+    @staticmethod
+    def _parse_symbol_from_display_name(display_name):
+        """Parses the symbol out of 'Name (SYMBOL)' for names not in the display list."""
+        idx = display_name.rfind('(')
+        if idx == -1 or not display_name.endswith(')'):
             return None
+        return display_name[idx + 1:-1].strip()
@@ -2,16 +2,64 @@
 import pandas as pd
 import logging
 import httpx
+import asyncio
 import time
 from datetime import datetime, timezone
 import numpy as np
 
 BINANCE_API_URL = "https://api.binance.com/api/v3/klines"
 MAX_LIMIT = 1000
+MAX_CONCURRENT_PAGES = 5 # Páginas buscadas simultaneamente (mantém o peso por minuto da Binance baixo)
+
+# Duração de cada candle em ms. Para '1M' usa o mês mais curto, garantindo no máximo MAX_LIMIT candles por página.
+INTERVAL_MS = {
+    '1s': 1_000, '1m': 60_000, '3m': 180_000, '5m': 300_000, '15m': 900_000, '30m': 1_800_000,
+    '1h': 3_600_000, '2h': 7_200_000, '4h': 14_400_000, '6h': 21_600_000, '8h': 28_800_000, '12h': 43_200_000,
+    '1d': 86_400_000, '3d': 259_200_000, '1w': 604_800_000, '1M': 2_419_200_000,
+}
+
+# Posição de cada coluna OHLCV dentro de uma k-line da Binance
+KLINE_OHLCV_COLUMNS = ((1, 'open'), (2, 'high'), (3, 'low'), (4, 'close'), (5, 'volume'))
+
+def _parse_utc_date(date_str):
+    """Parses a YYYY-MM-DD string into a UTC midnight datetime."""
+    # fromisoformat é implementado em C e muito mais rápido que strptime, que interpreta o formato a cada chamada
+    return datetime.fromisoformat(date_str).replace(tzinfo=timezone.utc)
 
 def date_to_milliseconds(date_str):
     """Converts a YYYY-MM-DD string to milliseconds since epoch."""
-    return int(datetime.strptime(date_str, "%Y-%m-%d").replace(tzinfo=timezone.utc).timestamp() * 1000)
+    return int(_parse_utc_date(date_str).timestamp() * 1000)
+
+async def _fetch_klines_page(client, semaphore, symbol, interval, start_ms, end_ms):
+    """Fetches one page (up to MAX_LIMIT candles) of k-lines for the [start_ms, end_ms] window."""
+    params = {
+        'symbol': symbol,
+        'interval': interval,
+        'startTime': start_ms,
+        'endTime': end_ms,
+        'limit': MAX_LIMIT
+    }
+    async with semaphore:
+        response = await client.get(BINANCE_API_URL, params=params, timeout=15.0)
+    response.raise_for_status()
+    data = response.json()
+    logging.info(f"Fetched {len(data)} records starting at {datetime.fromtimestamp(start_ms / 1000, tz=timezone.utc).strftime('%Y-%m-%d %H:%M:%S')}")
+    return data
+
+def _sample_data(end_date):
+    """Builds hardcoded hourly sample data ending at end_date, used when the API is unreachable."""
+    num_records = 720  # Approx 30 days of hourly data
+    end_dt = _parse_utc_date(end_date)
+    timestamps = pd.to_datetime(pd.date_range(end=end_dt, periods=num_records, freq='h'))
+    price_data = 40000 + (np.random.randn(num_records).cumsum() * 10)
+    return pd.DataFrame({
+        'timestamp': timestamps,
+        'open': price_data - np.random.uniform(-10, 10, num_records),
+        'high': price_data + np.random.uniform(0, 20, num_records),
+        'low': price_data - np.random.uniform(0, 20, num_records),
+        'close': price_data,
+        'volume': np.random.uniform(100, 1000, num_records)
+    }).set_index('timestamp')
 
 async def fetch_historical_data(symbol, start_date, end_date, interval='1h'):
     """
@@ -21,62 +69,60 @@ async def fetch_historical_data(symbol, start_date, end_date, interval='1h'):
     logging.info(f"Fetching historical data for {symbol} from {start_date} to {end_date} with {interval} interval.")
     start_ms = date_to_milliseconds(start_date)
     end_ms = date_to_milliseconds(end_date)
-    all_data = []
 
+    all_data = []
+    semaphore = asyncio.Semaphore(MAX_CONCURRENT_PAGES)
+    interval_ms = INTERVAL_MS.get(interval)
     async with httpx.AsyncClient() as client:
-        while start_ms < end_ms:
-            params = {
-                'symbol': symbol,
-                'interval': interval,
-                'startTime': start_ms,
-                'endTime': end_ms,
-                'limit': MAX_LIMIT
-            }
-            try:
-                response = await client.get(BINANCE_API_URL, params=params, timeout=15.0)
-                response.raise_for_status()
-                data = response.json()
-                if not data:
+        if interval_ms is not None:
+            # Como o intervalo é conhecido, as janelas de cada página (MAX_LIMIT candles) são calculadas
+            # de antemão e buscadas em paralelo, limitadas pelo semáforo, em vez de uma página por vez.
+            page_span = MAX_LIMIT * interval_ms
+            windows = [(page_start, min(page_start + page_span - 1, end_ms)) for page_start in range(start_ms, end_ms, page_span)]
+            pages = await asyncio.gather(
+                *(_fetch_klines_page(client, semaphore, symbol, interval, page_start, page_end) for page_start, page_end in windows),
+                return_exceptions=True
+            )
+        else:
+            # Intervalo fora da tabela: pagina sequencialmente, cada página começando após o último candle recebido
+            pages = []
+            cursor_ms = start_ms
+            while cursor_ms < end_ms:
+                try:
+                    page = await _fetch_klines_page(client, semaphore, symbol, interval, cursor_ms, end_ms)
+                except Exception as e:
+                    pages.append(e)
                     break
-                all_data.extend(data)
-                last_timestamp = data[-1][0]
-                start_ms = last_timestamp + 1
-                logging.info(f"Fetched {len(data)} records. Next start time: {datetime.fromtimestamp(start_ms / 1000, tz=timezone.utc).strftime('%Y-%m-%d %H:%M:%S')}")
-            except (httpx.RequestError, httpx.HTTPStatusError) as e:
-                logging.error(f"Network error while fetching data for {symbol}: {e}")
-                # WORKAROUND: Return hardcoded sample data for sandbox/offline testing.
-                logging.warning("API call failed. Returning hardcoded sample data for verification.")
-                num_records = 720  # Approx 30 days of hourly data
-                end_dt = datetime.strptime(end_date, "%Y-%m-%d").replace(tzinfo=timezone.utc)
-                timestamps = pd.to_datetime(pd.date_range(end=end_dt, periods=num_records, freq='h'))
-                price_data = 40000 + (np.random.randn(num_records).cumsum() * 10)
-                sample_df = pd.DataFrame({
-                    'timestamp': timestamps,
-                    'open': price_data - np.random.uniform(-10, 10, num_records),
-                    'high': price_data + np.random.uniform(0, 20, num_records),
-                    'low': price_data - np.random.uniform(0, 20, num_records),
-                    'close': price_data,
-                    'volume': np.random.uniform(100, 1000, num_records)
-                }).set_index('timestamp')
-                return sample_df
-            except Exception as e:
-                logging.error(f"An unexpected error occurred: {e}")
-                break
+                if not page:
+                    break
+                pages.append(page)
+                cursor_ms = page[-1][0] + 1
+
+    # As páginas voltam na ordem das janelas; páginas vazias (ex.: antes da listagem da moeda) são ignoradas
+    for page in pages:
+        if isinstance(page, (httpx.RequestError, httpx.HTTPStatusError)):
+            logging.error(f"Network error while fetching data for {symbol}: {page}")
+            # WORKAROUND: Return hardcoded sample data for sandbox/offline testing.
+            logging.warning("API call failed. Returning hardcoded sample data for verification.")
+            return _sample_data(end_date)
+        if isinstance(page, Exception):
+            logging.error(f"An unexpected error occurred: {page}")
+            break
+        all_data.extend(page)
 
     if not all_data:
         logging.warning("No data was fetched. Check the symbol and date range.")
         return pd.DataFrame()
 
-    df = pd.DataFrame(all_data, columns=[
-        'open_time', 'open', 'high', 'low', 'close', 'volume',
-        'close_time', 'quote_asset_volume', 'number_of_trades',
-        'taker_buy_base_asset_volume', 'taker_buy_quote_asset_volume', 'ignore'
-    ])
-    df['timestamp'] = pd.to_datetime(df['open_time'], unit='ms', utc=True)
-    for col in ['open', 'high', 'low', 'close', 'volume']:
-        df[col] = pd.to_numeric(df[col], errors='coerce')
-    df = df[['timestamp', 'open', 'high', 'low', 'close', 'volume']].set_index('timestamp')
-    end_date_dt = datetime.strptime(end_date, "%Y-%m-%d").replace(tzinfo=timezone.utc)
+    # Converte a lista de k-lines em um único array e extrai só as colunas usadas, já como
+    # float64 contíguo, em vez de montar o DataFrame de 12 colunas e converter coluna a coluna.
+    klines = np.array(all_data, dtype=object)
+    index = pd.DatetimeIndex(pd.to_datetime(klines[:, 0].astype(np.int64), unit='ms', utc=True), name='timestamp')
+    df = pd.DataFrame(
+        {col: klines[:, pos].astype(np.float64) for pos, col in KLINE_OHLCV_COLUMNS},
+        index=index
+    )
+    end_date_dt = _parse_utc_date(end_date)
     df = df[df.index < end_date_dt]
     logging.info(f"Successfully fetched a total of {len(df)} records for the specified period.")
     return df
@@ -17,12 +17,14 @@ from .cache_manager import generate_cache_key, save_to_cache, load_from_cache
 try:
     from .data_fetcher import fetch_historical_data
     from .backtester import run_backtest
-    from .chart_generator import generate_chart_image as generate_chart
+    from .chart_generator import generate_chart
 except ImportError as e:
     messagebox.showerror("Erro de Importação", f"Não foi possível importar componentes necessários: {e}")
     exit()
 
 class BacktesterGUI:
+    QUEUE_BATCH_SIZE = 200 # Máximo de mensagens processadas por ciclo de process_queue
+
     def __init__(self, root):
         self.root = root
         self.root.title("Ferramenta de Backtesting")
@@ -48,81 +50,35 @@ class BacktesterGUI:
         right_frame = ttk.Labelframe(top_frame, text="Configuração dos Indicadores", padding=10)
         right_frame.pack(side=tk.RIGHT, fill=tk.BOTH, expand=True, padx=(5, 0))
 
+        # Cada Labelframe usa grid (rótulo na coluna 0, campo na coluna 1) em vez de um
+        # Frame extra por linha, reduzindo o número de widgets criados.
+        right_frame.columnconfigure(1, weight=1)
+
         # Interval
-        interval_frame = ttk.Frame(right_frame)
-        interval_frame.pack(fill=tk.X, pady=2)
-        ttk.Label(interval_frame, text="Intervalo de Dados:").pack(side=tk.LEFT)
-        self.interval_combo = ttk.Combobox(interval_frame, values=['15m', '30m', '1h', '2h', '4h', '1d'], width=5)
+        ttk.Label(right_frame, text="Intervalo de Dados:").grid(row=0, column=0, sticky="w", pady=2)
+        self.interval_combo = ttk.Combobox(right_frame, values=['15m', '30m', '1h', '2h', '4h', '1d'], width=5)
         self.interval_combo.set('1h')
-        self.interval_combo.pack(side=tk.RIGHT)
+        self.interval_combo.grid(row=0, column=1, sticky="e", pady=2)
 
         # RSI Settings
         rsi_frame = ttk.Labelframe(right_frame, text="RSI", padding=5)
-        rsi_frame.pack(fill=tk.X, pady=5)
-
-        row1 = ttk.Frame(rsi_frame)
-        row1.pack(fill=tk.X)
-        ttk.Label(row1, text="Período:").pack(side=tk.LEFT)
-        self.rsi_period_entry = ttk.Entry(row1, width=5)
-        self.rsi_period_entry.insert(0, "14")
-        self.rsi_period_entry.pack(side=tk.RIGHT)
-
-        row2 = ttk.Frame(rsi_frame)
-        row2.pack(fill=tk.X, pady=2)
-        ttk.Label(row2, text="Sobrecompra:").pack(side=tk.LEFT)
-        self.rsi_overbought_entry = ttk.Entry(row2, width=5)
-        self.rsi_overbought_entry.insert(0, "75")
-        self.rsi_overbought_entry.pack(side=tk.RIGHT)
-
-        row3 = ttk.Frame(rsi_frame)
-        row3.pack(fill=tk.X)
-        ttk.Label(row3, text="Sobrevenda:").pack(side=tk.LEFT)
-        self.rsi_oversold_entry = ttk.Entry(row3, width=5)
-        self.rsi_oversold_entry.insert(0, "30")
-        self.rsi_oversold_entry.pack(side=tk.RIGHT)
+        rsi_frame.grid(row=1, column=0, columnspan=2, sticky="ew", pady=5)
+        self.rsi_period_entry = self._add_param_row(rsi_frame, 0, "Período:", "14")
+        self.rsi_overbought_entry = self._add_param_row(rsi_frame, 1, "Sobrecompra:", "75")
+        self.rsi_oversold_entry = self._add_param_row(rsi_frame, 2, "Sobrevenda:", "30")
 
         # MACD Settings
         macd_frame = ttk.Labelframe(right_frame, text="MACD", padding=5)
-        macd_frame.pack(fill=tk.X, pady=5)
-
-        row4 = ttk.Frame(macd_frame)
-        row4.pack(fill=tk.X)
-        ttk.Label(row4, text="Rápido:").pack(side=tk.LEFT)
-        self.macd_fast_entry = ttk.Entry(row4, width=5)
-        self.macd_fast_entry.insert(0, "12")
-        self.macd_fast_entry.pack(side=tk.RIGHT)
-
-        row5 = ttk.Frame(macd_frame)
-        row5.pack(fill=tk.X, pady=2)
-        ttk.Label(row5, text="Lento:").pack(side=tk.LEFT)
-        self.macd_slow_entry = ttk.Entry(row5, width=5)
-        self.macd_slow_entry.insert(0, "26")
-        self.macd_slow_entry.pack(side=tk.RIGHT)
-
-        row6 = ttk.Frame(macd_frame)
-        row6.pack(fill=tk.X)
-        ttk.Label(row6, text="Sinal:").pack(side=tk.LEFT)
-        self.macd_signal_entry = ttk.Entry(row6, width=5)
-        self.macd_signal_entry.insert(0, "9")
-        self.macd_signal_entry.pack(side=tk.RIGHT)
+        macd_frame.grid(row=2, column=0, columnspan=2, sticky="ew", pady=5)
+        self.macd_fast_entry = self._add_param_row(macd_frame, 0, "Rápido:", "12")
+        self.macd_slow_entry = self._add_param_row(macd_frame, 1, "Lento:", "26")
+        self.macd_signal_entry = self._add_param_row(macd_frame, 2, "Sinal:", "9")
 
         # Bollinger Settings
         bb_frame = ttk.Labelframe(right_frame, text="Bollinger Bands", padding=5)
-        bb_frame.pack(fill=tk.X, pady=5)
-
-        row7 = ttk.Frame(bb_frame)
-        row7.pack(fill=tk.X)
-        ttk.Label(row7, text="Período:").pack(side=tk.LEFT)
-        self.bb_period_entry = ttk.Entry(row7, width=5)
-        self.bb_period_entry.insert(0, "20")
-        self.bb_period_entry.pack(side=tk.RIGHT)
-
-        row8 = ttk.Frame(bb_frame)
-        row8.pack(fill=tk.X, pady=2)
-        ttk.Label(row8, text="Desvio:").pack(side=tk.LEFT)
-        self.bb_std_entry = ttk.Entry(row8, width=5)
-        self.bb_std_entry.insert(0, "2")
-        self.bb_std_entry.pack(side=tk.RIGHT)
+        bb_frame.grid(row=3, column=0, columnspan=2, sticky="ew", pady=5)
+        self.bb_period_entry = self._add_param_row(bb_frame, 0, "Período:", "20")
+        self.bb_std_entry = self._add_param_row(bb_frame, 1, "Desvio:", "2")
 
          # --- Input Frame ---
         input_frame = ttk.Labelframe(left_frame, text="Parâmetros da Análise", padding=10)
@@ -173,7 +129,8 @@ class BacktesterGUI:
         self.stop_button = ttk.Button(action_frame, text="Parar", command=self.stop_backtest, state="disabled", bootstyle=DANGER)
         self.stop_button.pack(side=tk.LEFT, padx=5)
 
-        self.status_label = ttk.Label(action_frame, text="")
+        self.status_var = tk.StringVar(value="")
+        self.status_label = ttk.Label(action_frame, textvariable=self.status_var)
         self.status_label.pack(side=tk.LEFT, padx=10)
 
         spacer = ttk.Frame(action_frame)
@@ -202,6 +159,7 @@ class BacktesterGUI:
         self.summary_frame = ttk.Labelframe(left_frame, text="Resumo da Taxa de Acerto", padding=10)
         self.summary_frame.pack(fill=tk.X, pady=(10, 5))
         self.summary_labels = {}
+        self._summary_label_pool = [] # Labels de resumo reaproveitados entre execuções
 
         self.queue = queue.Queue()
         self.root.after(100, self.process_queue)
@@ -209,11 +167,25 @@ class BacktesterGUI:
         # --- Display Alert Configurations ---
         # Removed as per new requirement
 
+    def set_status(self, text):
+        """ Updates the status label through its StringVar, skipping unchanged text. """
+        if self.status_var.get() != text:
+            self.status_var.set(text)
+
+    def _add_param_row(self, parent, row, text, default):
+        """ Adds a label/entry pair to a grid row of `parent` and returns the entry. """
+        parent.columnconfigure(1, weight=1)
+        ttk.Label(parent, text=text).grid(row=row, column=0, sticky="w", pady=1)
+        entry = ttk.Entry(parent, width=5)
+        entry.insert(0, default)
+        entry.grid(row=row, column=1, sticky="e", pady=1)
+        return entry
+
     def setup_results_display(self, timeframes):
         """ Dynamically configures the Treeview and summary labels based on selected timeframes. """
-        # --- Clear previous summary widgets ---
-        for widget in self.summary_frame.winfo_children():
-            widget.destroy()
+        # --- Hide previous summary labels (they are reused below instead of recreated) ---
+        for label in self._summary_label_pool:
+            label.grid_remove()
         self.summary_labels.clear()
 
         # --- Configure Treeview ---
@@ -242,18 +214,33 @@ class BacktesterGUI:
 
         # --- Configure Summary Labels ---
         for i, tf in enumerate(timeframes):
-            label = ttk.Label(self.summary_frame, text=f"Período {tf}: N/A")
+            if i < len(self._summary_label_pool):
+                label = self._summary_label_pool[i]
+                label.config(text=f"Período {tf}: N/A")
+            else:
+                label = ttk.Label(self.summary_frame, text=f"Período {tf}: N/A")
+                self._summary_label_pool.append(label)
             label.grid(row=i, column=0, padx=5, pady=2, sticky="w")
             self.summary_labels[tf] = label
 
     def process_queue(self):
+        # Esvazia a fila em lote a cada ciclo (até um limite, para não travar a interface)
+        # em vez de tratar uma única mensagem a cada 100 ms.
+        pending = False
         try:
-            message = self.queue.get_nowait()
-            self.update_results(message)
+            for _ in range(self.QUEUE_BATCH_SIZE):
+                message = self.queue.get_nowait()
+                self.update_results(message)
+            pending = True
         except queue.Empty:
             pass
         finally:
-            self.root.after(100, self.process_queue)
+            # Lote cheio: ainda há linhas na fila. O próximo lote entra assim que o Tk ficar ocioso
+            # (após redesenhar a tabela e tratar eventos), sem esperar os 100 ms do polling.
+            if pending:
+                self.root.after_idle(self.process_queue)
+            else:
+                self.root.after(100, self.process_queue)
 
     def update_results(self, message):
         if not isinstance(message, dict):
@@ -266,7 +253,10 @@ class BacktesterGUI:
             # --- Base Info ---
             ts_str = alert_data.get('timestamp', '')
             try:
-                ts = pd.to_datetime(ts_str).strftime('%Y-%m-%d %H:%M:%S')
+                parsed_ts = message.get("timestamp")
+                if parsed_ts is None:
+                    parsed_ts = pd.to_datetime(ts_str)
+                ts = parsed_ts.strftime('%Y-%m-%d %H:%M:%S')
             except Exception:
                 ts = ts_str
 
@@ -298,7 +288,7 @@ class BacktesterGUI:
             self.results_data.append(alert_data) # Store original data
 
         elif msg_type == "status":
-            self.status_label.config(text=message.get("msg"))
+            self.set_status(message.get("msg", ""))
         elif msg_type == "error":
             messagebox.showerror("Erro na Análise", message.get("msg"))
         elif msg_type == "task_done":
@@ -325,7 +315,7 @@ class BacktesterGUI:
         self.stop_button.config(state="normal")
         self.export_button.config(state="disabled")
         self.chart_button.config(state="disabled")
-        self.status_label.config(text="Analisando...")
+        self.set_status("Analisando...")
 
         # Get selected timeframes
         selected_timeframes = {name: data['minutes'] for name, data in self.timeframe_vars.items() if data['var'].get()}
@@ -338,9 +328,8 @@ class BacktesterGUI:
         # Setup display for the new run
         self.setup_results_display(list(selected_timeframes.keys()))
 
-        # Clear previous results from the treeview
-        for i in self.results_tree.get_children():
-            self.results_tree.delete(i)
+        # Clear previous results from the treeview (uma única chamada Tcl para todos os itens)
+        self.results_tree.delete(*self.results_tree.get_children())
 
         # Collect User Parameters
         try:
@@ -414,10 +403,12 @@ class BacktesterGUI:
                 if self.stop_event.is_set():
                     self.queue.put({"type": "status", "msg": "Análise interrompida pelo usuário."})
                     break
-                self.queue.put({"type": "alert", "data": alert})
+                # Converte o timestamp uma única vez: serve ao gráfico e à linha da tabela
+                timestamp = pd.to_datetime(alert["timestamp"])
+                self.queue.put({"type": "alert", "data": alert, "timestamp": timestamp})
                 # Re-format for the chart generator
                 formatted_signals.append({
-                    "timestamp": pd.to_datetime(alert["timestamp"]),
+                    "timestamp": timestamp,
                     "price": alert["snapshot"]["price"],
                     "message": alert["description"]
                 })
@@ -430,19 +421,19 @@ class BacktesterGUI:
         if self.is_paused:
             self.pause_event.clear()
             self.pause_button.config(text="Pausar")
-            self.status_label.config(text="Analisando...")
+            self.set_status("Analisando...")
             self.is_paused = False
         else:
             self.pause_event.set()
             self.pause_button.config(text="Continuar")
-            self.status_label.config(text="Pausado")
+            self.set_status("Pausado")
             self.is_paused = True
 
     def stop_backtest(self):
         self.stop_event.set()
 
     def gui_task_done(self):
-        self.status_label.config(text="Concluído")
+        self.set_status("Concluído")
         self.run_button.config(state="normal")
         self.pause_button.config(state="disabled", text="Pausar")
         self.stop_button.config(state="disabled")
@@ -464,17 +455,18 @@ class BacktesterGUI:
                 label.config(text=f"Período {tf}: Falha ao buscar dados detalhados.")
             return
 
+        # Um DataFrame com os resultados permite contar acertos/erros de cada período com
+        # comparações vetorizadas, em vez de percorrer a lista de dicts uma vez por período.
+        results_df = pd.DataFrame(self.results_data)
         timeframes = list(self.summary_labels.keys()) # Get dynamically set timeframes
         for tf in timeframes:
             hit_key = f'hit_{tf}'
-            hits = 0
-            misses = 0
-
-            for result in self.results_data:
-                if result.get(hit_key) is True:
-                    hits += 1
-                elif result.get(hit_key) is False:
-                    misses += 1
+            if hit_key in results_df.columns:
+                hit_column = results_df[hit_key]
+                hits = int(hit_column.eq(True).sum())
+                misses = int(hit_column.eq(False).sum())
+            else:
+                hits = misses = 0
 
             total = hits + misses
             if total > 0:
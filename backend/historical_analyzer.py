@@ -1,3 +1,4 @@
+import re
 from datetime import timedelta
 import pandas as pd
 import logging
@@ -193,6 +194,13 @@ SIGNAL_TYPE_MAPPING = {
     'vwap_cruz_baixa': 'sell',
 }
 
+# Uma única regex com grupos nomeados 'buy'/'sell' classifica a condição por prefixo
+# em uma só passada (m.lastgroup indica o tipo do sinal).
+_SIGNAL_TYPE_RE = re.compile('|'.join(
+    f"(?P<{signal_type}>{'|'.join(re.escape(key) for key, stype in SIGNAL_TYPE_MAPPING.items() if stype == signal_type)})"
+    for signal_type in ('buy', 'sell')
+))
+
 async def calculate_hit_rate(alerts_df: pd.DataFrame, symbol: str, timeframes_config: dict):
     """
     Calculates the hit rate of alerts by analyzing price movements after each alert.
@@ -230,23 +238,30 @@ async def calculate_hit_rate(alerts_df: pd.DataFrame, symbol: str, timeframes_co
     alerts_df['hit_rate_calculated'] = True
     # --- End Optimization ---
 
+    # Sorted index + binary search: each lookup is O(log N) instead of a full boolean mask
+    if not future_df.index.is_monotonic_increasing:
+        future_df = future_df.sort_index()
+    future_index = future_df.index
+    future_closes = future_df['close'].to_numpy()
+
     for index, alert in alerts_df.iterrows():
         alert_time = alert['timestamp']
         start_price = alert['snapshot']['price']
         condition = alert['condition']
 
-        signal_type = next((stype for key, stype in SIGNAL_TYPE_MAPPING.items() if condition.startswith(key)), None)
-        if not signal_type:
+        signal_match = _SIGNAL_TYPE_RE.match(condition)
+        if not signal_match:
             continue
+        signal_type = signal_match.lastgroup
 
         for tf_name, tf_minutes in timeframes_minutes.items():
             future_time = alert_time + timedelta(minutes=tf_minutes)
 
             # Find the closest price point in the pre-fetched future data
-            future_price_series = future_df[future_df.index >= future_time]
+            future_pos = future_index.searchsorted(future_time, side='left')
 
-            if not future_price_series.empty:
-                future_price = future_price_series.iloc[0]['close']
+            if future_pos < len(future_closes):
+                future_price = future_closes[future_pos]
                 pct_change = ((future_price - start_price) / start_price) * 100 if start_price != 0 else 0
 
                 hit = (signal_type == 'buy' and pct_change > 0) or \
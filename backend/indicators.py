@@ -32,11 +32,15 @@ def calculate_bollinger_bands(df, period=20, std_dev=2):
         nan_series = pd.Series(np.nan, index=df.index)
         return nan_series, nan_series, nan_series
 
+    # Uma única janela móvel serve para a média e o desvio padrão; ambos usam
+    # os kernels incrementais (O(N)) do pandas sobre o array de fechamento.
+    rolling_close = df['close'].rolling(window=period, min_periods=1)
+
     # Calcula a Média Móvel Simples
-    sma = df['close'].rolling(window=period, min_periods=1).mean()
+    sma = rolling_close.mean()
 
     # Calcula o Desvio Padrão
-    std = df['close'].rolling(window=period, min_periods=1).std()
+    std = rolling_close.std()
 
     # Calcula as bandas superior e inferior
     upper_band = sma + (std * std_dev)
@@ -92,8 +96,9 @@ def calculate_emas(df, periods=[50, 200]):
     """Calcula as Médias Móveis Exponenciais (EMAs) para uma lista de períodos."""
     emas = {}
     if df is None or df.empty: return emas
+    close = df['close']
     for period in periods:
-        if len(df) >= period: emas[period] = df['close'].ewm(span=period, adjust=False).mean()
+        if len(close) >= period: emas[period] = close.ewm(span=period, adjust=False).mean()
     return emas
 
 def calculate_hilo_signals(df, length=34, ma_type="EMA", offset=0, simple_hilo=True, return_series=False):
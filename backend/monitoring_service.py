@@ -17,12 +17,10 @@ from .indicators import (
     calculate_vwap
 )
 from .notification_service import send_telegram_alert
-from pycoingecko import CoinGeckoAPI
 from .app_state import load_coin_list_cache, save_coin_list_cache
 from .notification_service import send_telegram_alert
 
-
-cg_client = CoinGeckoAPI()
+_KLINE_PRICE_COLUMNS = ['close', 'high', 'low']
 
 def get_klines_data(symbol, interval='1h', limit=300):
     """Busca dados de k-lines da Binance com cache, rate limiting e validação."""
@@ -40,12 +38,12 @@ def get_klines_data(symbol, interval='1h', limit=300):
     params = {'symbol': symbol, 'interval': interval, 'limit': limit}
 
     try:
-        response = requests.get(url, params=params, timeout=10)
+        response = robust_services.get_binance_session().get(url, params=params, timeout=10)
         response.raise_for_status()
         df = pd.DataFrame(response.json(), columns=['open_time', 'open', 'high', 'low', 'close', 'volume', 'close_time', 'quote_asset_volume', 'number_of_trades', 'taker_buy_base_asset_volume', 'taker_buy_quote_asset_volume', 'ignore'])
-        df['close'] = df['close'].apply(robust_services.DataValidator.safe_price)
-        df['high'] = df['high'].apply(robust_services.DataValidator.safe_price)
-        df['low'] = df['low'].apply(robust_services.DataValidator.safe_price)
+        # Equivalente vetorizado de DataValidator.safe_price: valores inválidos, ausentes ou negativos viram 0.0
+        prices = df[_KLINE_PRICE_COLUMNS].apply(pd.to_numeric, errors='coerce')
+        df[_KLINE_PRICE_COLUMNS] = prices.where(prices >= 0, 0.0).astype('float64')
         robust_services.data_cache.set(cache_args, df)
         return df
     except requests.exceptions.RequestException as e:
@@ -60,7 +58,7 @@ def get_ticker_data():
 
     robust_services.rate_limiter.wait_if_needed()
     try:
-        response = requests.get("https://api.binance.com/api/v3/ticker/24hr", timeout=10)
+        response = robust_services.get_binance_session().get("https://api.binance.com/api/v3/ticker/24hr", timeout=10)
         response.raise_for_status()
         ticker_data = {item['symbol']: item for item in response.json()}
         robust_services.data_cache.set(cache_args, ticker_data)
@@ -80,11 +78,20 @@ def get_market_caps_coingecko(symbols_to_monitor, all_coins):
         logging.error("A lista de moedas da CoinGecko não está disponível.")
         return {}
 
+    # Uma única passada pela lista de moedas (~13k) com lookup O(1) nos símbolos desejados,
+    # em vez de varrer a lista inteira para cada símbolo monitorado.
+    wanted_base_assets = {binance_symbol.replace('USDT', '').lower() for binance_symbol in symbols_to_monitor}
+    coin_by_base_asset = {}
+    for item in all_coins:
+        symbol_lc = item['symbol'].lower()
+        if symbol_lc in wanted_base_assets and symbol_lc not in coin_by_base_asset:
+            coin_by_base_asset[symbol_lc] = item
+
     for binance_symbol in symbols_to_monitor:
         base_asset = binance_symbol.replace('USDT', '').lower()
 
-        # Busca case-insensitive pelo símbolo
-        coin_info = next((item for item in all_coins if item['symbol'].lower() == base_asset), None)
+        # Busca case-insensitive pelo símbolo (mantém a primeira ocorrência, como antes)
+        coin_info = coin_by_base_asset.get(base_asset)
 
         if coin_info:
             coin_id = coin_info['id']
@@ -101,7 +108,7 @@ def get_market_caps_coingecko(symbols_to_monitor, all_coins):
 
     try:
         robust_services.rate_limiter.wait_if_needed()
-        response = cg_client.get_coins_markets(vs_currency='usd', ids=','.join(coin_ids_to_fetch))
+        response = robust_services.get_coingecko_client().get_coins_markets(vs_currency='usd', ids=','.join(coin_ids_to_fetch))
         for coin_data in response:
             original_binance_symbol = symbol_to_coin_id.get(coin_data['id'])
             if original_binance_symbol:
@@ -123,7 +130,7 @@ def get_cached_coin_list():
     logging.info("Buscando nova lista de moedas da CoinGecko (cache expirado ou inexistente)...")
     robust_services.rate_limiter.wait_if_needed()
     try:
-        coins_list = cg_client.get_coins_list()
+        coins_list = robust_services.get_coingecko_client().get_coins_list()
         save_coin_list_cache(coins_list) # Salva a lista completa no cache
 
         logging.info("Lista de moedas da CoinGecko carregada e cache atualizado.")
@@ -134,13 +141,19 @@ def get_cached_coin_list():
 
 def fetch_all_binance_symbols_startup(existing_config):
     """Busca todos os símbolos USDT da Binance na inicialização."""
+    # O exchangeInfo tem vários MB e muda raramente: a lista filtrada fica em cache por 10 minutos
+    cache_args = {'func': 'fetch_all_binance_symbols_startup'}
+    cached_symbols = robust_services.data_cache.get(cache_args, ttl=600)
+    if cached_symbols is not None: return cached_symbols
+
     logging.info("Buscando lista de moedas da Binance...")
     robust_services.rate_limiter.wait_if_needed()
     try:
-        response = requests.get("https://api.binance.com/api/v3/exchangeInfo", timeout=15)
+        response = robust_services.get_binance_session().get("https://api.binance.com/api/v3/exchangeInfo", timeout=15)
         response.raise_for_status()
         symbols = sorted([s['symbol'] for s in response.json()['symbols'] if s['symbol'].endswith('USDT')])
         logging.info(f"{len(symbols)} moedas encontradas na Binance.")
+        robust_services.data_cache.set(cache_args, symbols)
         return symbols
     except Exception as e:
         logging.error(f"Não foi possível buscar a lista de moedas da Binance: {e}")
@@ -159,42 +172,69 @@ def fetch_all_binance_symbols_startup(existing_config):
         logging.warning(f"WORKAROUND: Retornando uma lista combinada de {len(combined_symbols)} moedas (hardcoded + config) como fallback.")
         return combined_symbols
 
+# Mapeamentos fixos usados por _get_sound_for_trigger, construídos uma única vez
+_TRIGGER_KEY_TO_SOUND_CONFIG = {
+    'RSI_SOBRECOMPRA': 'overbought',
+    'RSI_SOBREVENDA': 'oversold',
+    'CRUZ_DOURADA': 'golden_cross',
+    'CRUZ_DA_MORTE': 'death_cross',
+    'PRECO_ACIMA': 'price_above',
+    'PRECO_ABAIXO': 'price_below',
+    'VOLUME_ANORMAL': 'high_volume',
+    'FUGA_CAPITAL': 'critical_alert',
+    'ENTRADA_CAPITAL': 'critical_alert',
+    'HILO_COMPRA': 'golden_cross',
+    'HILO_VENDA': 'death_cross',
+}
+
+_DEFAULT_SOUNDS = {
+    'overbought': 'sobrecomprado.wav',
+    'oversold': 'sobrevendido.wav',
+    'golden_cross': 'cruzamentoAlta.wav',
+    'death_cross': 'cruzamentoBaixa.wav',
+    'price_above': 'precoAcima.wav',
+    'price_below': 'precoAbaixo.wav',
+    'high_volume': 'volumeAlto.wav',
+    'critical_alert': 'alertaCritico.wav',
+    'default_alert': 'Alerta.mp3',
+}
+
 def _get_sound_for_trigger(trigger_key, sound_config):
     """Determina o som apropriado para um gatilho de alerta com base na sua chave programática."""
     if not sound_config:
         return os.path.join('sons', 'Alerta.mp3')
 
-    key_to_config_map = {
-        'RSI_SOBRECOMPRA': 'overbought',
-        'RSI_SOBREVENDA': 'oversold',
-        'CRUZ_DOURADA': 'golden_cross',
-        'CRUZ_DA_MORTE': 'death_cross',
-        'PRECO_ACIMA': 'price_above',
-        'PRECO_ABAIXO': 'price_below',
-        'VOLUME_ANORMAL': 'high_volume',
-        'FUGA_CAPITAL': 'critical_alert',
-        'ENTRADA_CAPITAL': 'critical_alert',
-        'HILO_COMPRA': 'golden_cross',
-        'HILO_VENDA': 'death_cross',
-    }
-
-    default_sounds = {
-        'overbought': 'sobrecomprado.wav',
-        'oversold': 'sobrevendido.wav',
-        'golden_cross': 'cruzamentoAlta.wav',
-        'death_cross': 'cruzamentoBaixa.wav',
-        'price_above': 'precoAcima.wav',
-        'price_below': 'precoAbaixo.wav',
-        'high_volume': 'volumeAlto.wav',
-        'critical_alert': 'alertaCritico.wav',
-        'default_alert': 'Alerta.mp3',
-    }
-
-    config_key = key_to_config_map.get(trigger_key, 'default_alert')
-    sound_file = sound_config.get(config_key, default_sounds.get(config_key))
+    config_key = _TRIGGER_KEY_TO_SOUND_CONFIG.get(trigger_key, 'default_alert')
+    sound_file = sound_config.get(config_key, _DEFAULT_SOUNDS.get(config_key))
 
     return os.path.join('sons', sound_file)
 
+# Definições das condições de alerta: nome da condição -> (chave programática, mensagem).
+# Mensagens com '{}' recebem o valor configurado da condição, formatado só quando o alerta dispara.
+_ALERT_DEFINITIONS = {
+    'preco_baixo': ('PRECO_ABAIXO', "Preço Abaixo de ${:.2f}"),
+    'preco_alto': ('PRECO_ACIMA', "Preço Acima de ${:.2f}"),
+    'rsi_sobrevendido': ('RSI_SOBREVENDA', "RSI em Sobrevenda (<= {:.1f})"),
+    'rsi_sobrecomprado': ('RSI_SOBRECOMPRA', "RSI em Sobrecompra (>= {:.1f})"),
+    'bollinger_abaixo': ('PRECO_ABAIXO_BANDA_INFERIOR', "Preço Abaixo da Banda de Bollinger"),
+    'bollinger_acima': ('PRECO_ACIMA_BANDA_SUPERIOR', "Preço Acima da Banda de Bollinger"),
+    'macd_cruz_baixa': ('CRUZAMENTO_MACD_BAIXA', "MACD: Cruzamento de Baixa"),
+    'macd_cruz_alta': ('CRUZAMENTO_MACD_ALTA', "MACD: Cruzamento de Alta"),
+    'mme_cruz_morte': ('CRUZ_DA_MORTE', "MME: Cruz da Morte (50/200)"),
+    'mme_cruz_dourada': ('CRUZ_DOURADA', "MME: Cruz Dourada (50/200)"),
+    'hilo_compra': ('HILO_COMPRA', "HiLo: Sinal de Compra"),
+    'hilo_venda': ('HILO_VENDA', "HiLo: Sinal de Venda"),
+    'media_movel_cima': ('MEDIA_MOVEL_CIMA', "Preço cruzou MME {} para Cima + MACD > 0"),
+    'media_movel_baixo': ('MEDIA_MOVEL_BAIXO', "Preço cruzou MME {} para Baixo"),
+}
+
+def _make_trigger(name, conditions, default=0):
+    """Monta o gatilho {'key', 'msg'} de uma condição, formatando a mensagem com o valor configurado."""
+    key, msg = _ALERT_DEFINITIONS[name]
+    if '{' in msg:
+        msg = msg.format(conditions.get(name, {}).get('value', default))
+    return {'key': key, 'msg': msg}
+
 def _check_and_trigger_alerts(symbol, alert_config, analysis_data, global_config, parameters=None):
     """
     Verifica as condições de alerta para um símbolo e retorna uma lista de alertas disparados.
@@ -225,60 +265,42 @@ def _check_and_trigger_alerts(symbol, alert_config, analysis_data, global_config
         death_cross_active = False
         alert_config['death_cross_active'] = False # Persiste o estado
 
-    # Define as condições de alerta
-    alert_definitions = {
-        'preco_baixo': {'key': 'PRECO_ABAIXO', 'msg': f"Preço Abaixo de ${conditions.get('preco_baixo', {}).get('value', 0):.2f}"},
-        'preco_alto': {'key': 'PRECO_ACIMA', 'msg': f"Preço Acima de ${conditions.get('preco_alto', {}).get('value', 0):.2f}"},
-        'rsi_sobrevendido': {'key': 'RSI_SOBREVENDA', 'msg': f"RSI em Sobrevenda (<= {conditions.get('rsi_sobrevendido', {}).get('value', rsi_oversold):.1f})"},
-        'rsi_sobrecomprado': {'key': 'RSI_SOBRECOMPRA', 'msg': f"RSI em Sobrecompra (>= {conditions.get('rsi_sobrecomprado', {}).get('value', rsi_overbought):.1f})"},
-        'bollinger_abaixo': {'key': 'PRECO_ABAIXO_BANDA_INFERIOR', 'msg': "Preço Abaixo da Banda de Bollinger"},
-        'bollinger_acima': {'key': 'PRECO_ACIMA_BANDA_SUPERIOR', 'msg': "Preço Acima da Banda de Bollinger"},
-        'macd_cruz_baixa': {'key': 'CRUZAMENTO_MACD_BAIXA', 'msg': "MACD: Cruzamento de Baixa"},
-        'macd_cruz_alta': {'key': 'CRUZAMENTO_MACD_ALTA', 'msg': "MACD: Cruzamento de Alta"},
-        'mme_cruz_morte': {'key': 'CRUZ_DA_MORTE', 'msg': "MME: Cruz da Morte (50/200)"},
-        'mme_cruz_dourada': {'key': 'CRUZ_DOURADA', 'msg': "MME: Cruz Dourada (50/200)"},
-        'hilo_compra': {'key': 'HILO_COMPRA', 'msg': "HiLo: Sinal de Compra"},
-        'hilo_venda': {'key': 'HILO_VENDA', 'msg': "HiLo: Sinal de Venda"},
-        'media_movel_cima': {'key': 'MEDIA_MOVEL_CIMA', 'msg': f"Preço cruzou MME {conditions.get('media_movel_cima', {}).get('value', 200)} para Cima + MACD > 0"},
-        'media_movel_baixo': {'key': 'MEDIA_MOVEL_BAIXO', 'msg': f"Preço cruzou MME {conditions.get('media_movel_baixo', {}).get('value', 17)} para Baixo"},
-    }
-
     active_triggers = []
     # Lógica de verificação de condições
-    if conditions.get('PRECO_ABAIXO', {}).get('enabled') and current_price <= conditions['PRECO_ABAIXO']['value']: active_triggers.append(alert_definitions['preco_baixo'])
-    if conditions.get('PRECO_ACIMA', {}).get('enabled') and current_price >= conditions['PRECO_ACIMA']['value']: active_triggers.append(alert_definitions['preco_alto'])
-    if conditions.get('rsi_sobrevendido', {}).get('enabled') and rsi <= conditions['rsi_sobrevendido']['value']: active_triggers.append(alert_definitions['rsi_sobrevendido'])
+    if conditions.get('PRECO_ABAIXO', {}).get('enabled') and current_price <= conditions['PRECO_ABAIXO']['value']: active_triggers.append(_make_trigger('preco_baixo', conditions))
+    if conditions.get('PRECO_ACIMA', {}).get('enabled') and current_price >= conditions['PRECO_ACIMA']['value']: active_triggers.append(_make_trigger('preco_alto', conditions))
+    if conditions.get('rsi_sobrevendido', {}).get('enabled') and rsi <= conditions['rsi_sobrevendido']['value']: active_triggers.append(_make_trigger('rsi_sobrevendido', conditions, rsi_oversold))
 
     if (config := conditions.get('rsi_sobrecomprado', {})) and config.get('enabled'):
         if rsi >= config.get('value', rsi_overbought):
-            active_triggers.append(alert_definitions['rsi_sobrecomprado'])
+            active_triggers.append(_make_trigger('rsi_sobrecomprado', conditions, rsi_overbought))
 
-    if conditions.get('bollinger_abaixo', {}).get('enabled') and analysis_data.get('bollinger_signal') == "Abaixo da Banda": active_triggers.append(alert_definitions['bollinger_abaixo'])
-    if conditions.get('bollinger_acima', {}).get('enabled') and analysis_data.get('bollinger_signal') == "Acima da Banda": active_triggers.append(alert_definitions['bollinger_acima'])
-    if conditions.get('macd_cruz_baixa', {}).get('enabled') and analysis_data.get('macd_signal') == "Cruzamento de Baixa": active_triggers.append(alert_definitions['macd_cruz_baixa'])
+    if conditions.get('bollinger_abaixo', {}).get('enabled') and analysis_data.get('bollinger_signal') == "Abaixo da Banda": active_triggers.append(_make_trigger('bollinger_abaixo', conditions))
+    if conditions.get('bollinger_acima', {}).get('enabled') and analysis_data.get('bollinger_signal') == "Acima da Banda": active_triggers.append(_make_trigger('bollinger_acima', conditions))
+    if conditions.get('macd_cruz_baixa', {}).get('enabled') and analysis_data.get('macd_signal') == "Cruzamento de Baixa": active_triggers.append(_make_trigger('macd_cruz_baixa', conditions))
 
     # MACD Buy Signal requires RSI < Oversold Threshold
-    if conditions.get('macd_cruz_alta', {}).get('enabled') and analysis_data.get('macd_signal') == "Cruzamento de Alta" and rsi < rsi_oversold: active_triggers.append(alert_definitions['macd_cruz_alta'])
+    if conditions.get('macd_cruz_alta', {}).get('enabled') and analysis_data.get('macd_signal') == "Cruzamento de Alta" and rsi < rsi_oversold: active_triggers.append(_make_trigger('macd_cruz_alta', conditions))
 
-    if conditions.get('mme_cruz_morte', {}).get('enabled') and analysis_data.get('mme_cross') == "Cruz da Morte" and current_price < analysis_data.get('mme_200', float('inf')): active_triggers.append(alert_definitions['mme_cruz_morte'])
-    if conditions.get('mme_cruz_dourada', {}).get('enabled') and analysis_data.get('mme_cross') == "Cruz Dourada": active_triggers.append(alert_definitions['mme_cruz_dourada'])
+    if conditions.get('mme_cruz_morte', {}).get('enabled') and analysis_data.get('mme_cross') == "Cruz da Morte" and current_price < analysis_data.get('mme_200', float('inf')): active_triggers.append(_make_trigger('mme_cruz_morte', conditions))
+    if conditions.get('mme_cruz_dourada', {}).get('enabled') and analysis_data.get('mme_cross') == "Cruz Dourada": active_triggers.append(_make_trigger('mme_cruz_dourada', conditions))
 
     # Aplica o "Filter Mode" para suprimir alertas de compra se a Death Cross estiver ativa
     if not death_cross_active:
         if conditions.get('hilo_compra', {}).get('enabled') and analysis_data.get('hilo_signal') == "HiLo Buy":
-            active_triggers.append(alert_definitions['hilo_compra'])
+            active_triggers.append(_make_trigger('hilo_compra', conditions))
 
         if (config := conditions.get('media_movel_cima', {})) and config.get('enabled'):
             period = config.get('value', 200)
             if analysis_data.get('media_movel_cross', {}).get(period) == "Cruzamento de Alta" and macd_value > 0:
-                active_triggers.append(alert_definitions['media_movel_cima'])
+                active_triggers.append(_make_trigger('media_movel_cima', conditions, 200))
 
-    if conditions.get('hilo_venda', {}).get('enabled') and analysis_data.get('hilo_signal') == "HiLo Sell": active_triggers.append(alert_definitions['hilo_venda'])
+    if conditions.get('hilo_venda', {}).get('enabled') and analysis_data.get('hilo_signal') == "HiLo Sell": active_triggers.append(_make_trigger('hilo_venda', conditions))
 
     if (config := conditions.get('media_movel_baixo', {})) and config.get('enabled'):
         period = config.get('value', 17)
         if analysis_data.get('media_movel_cross', {}).get(period) == "Cruzamento de Baixa":
-            active_triggers.append(alert_definitions['media_movel_baixo'])
+            active_triggers.append(_make_trigger('media_movel_baixo', conditions, 17))
 
     now = datetime.now()
     telegram_config = global_config.get('telegram_config', {})
@@ -402,7 +424,8 @@ def _analyze_symbol(symbol, ticker_data, market_cap=None, coingecko_mapping=None
         upper_band_series, lower_band_series, _ = calculate_bollinger_bands(df, period=bb_period, std_dev=bb_std)
         macd_signal, macd_value, macd_signal_line, macd_histogram = calculate_macd(df, fast=macd_fast, slow=macd_slow, signal=macd_signal)
         _, _, hilo_signal = calculate_hilo_signals(df)
-        emas = calculate_emas(df, periods=[50, 200])
+        # Só a MME 200 é usada abaixo; calcular a de 50 seria uma passada extra sobre 'close'
+        emas = calculate_emas(df, periods=[200])
 
         rsi_value = float(rsi_series.iloc[-1]) if not rsi_series.empty and pd.notna(rsi_series.iloc[-1]) else 0.0
         upper_band = float(upper_band_series.iloc[-1]) if not upper_band_series.empty and pd.notna(upper_band_series.iloc[-1]) else 0.0
@@ -513,7 +536,7 @@ def get_btc_dominance():
             return cached_data
 
         robust_services.rate_limiter.wait_if_needed()
-        global_data = cg_client.get_global()
+        global_data = robust_services.get_coingecko_client().get_global()
 
         # A estrutura da resposta é {'data': {'market_cap_percentage': {'btc': 49.9}}}
         btc_dominance = global_data.get('market_cap_percentage', {}).get('btc')
@@ -534,7 +557,7 @@ def get_top_100_coins():
     """Busca as 100 principais criptomoedas por capitalização de mercado da CoinGecko."""
     try:
         robust_services.rate_limiter.wait_if_needed()
-        coins = cg_client.get_coins_markets(vs_currency='usd', order='market_cap_desc', per_page=100, page=1)
+        coins = robust_services.get_coingecko_client().get_coins_markets(vs_currency='usd', order='market_cap_desc', per_page=100, page=1)
         return coins
     except Exception as e:
         logging.error(f"Erro ao buscar as 100 principais moedas da CoinGecko: {e}")
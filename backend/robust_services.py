@@ -6,10 +6,13 @@ import hashlib
 import logging
 import pandas as pd
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from collections import deque
-from threading import Lock
+from threading import Lock, local
 from dataclasses import dataclass, asdict
 from typing import Optional, Dict, Any
+from pycoingecko import CoinGeckoAPI
 
 # ==========================================
 # 1. RATE LIMITING
@@ -101,13 +104,43 @@ class BinanceRateLimiter:
 
 rate_limiter = BinanceRateLimiter()
 
+class TokenBucket:
+    """
+    Rate limiter proativo (token bucket): espaça as chamadas para nunca ultrapassar
+    o limite da API, em vez de esperar só depois que o limite já foi atingido.
+    """
+    def __init__(self, capacity=10, refill_rate=10 / 60):
+        self.capacity = capacity
+        self.refill_rate = refill_rate  # tokens por segundo
+        self.tokens = float(capacity)
+        self.last_refill = time.monotonic()
+        self.lock = Lock()
+
+    def wait_if_needed(self):
+        with self.lock:
+            now = time.monotonic()
+            self.tokens = min(self.capacity, self.tokens + (now - self.last_refill) * self.refill_rate)
+            self.last_refill = now
+
+            if self.tokens < 1:
+                sleep_time = (1 - self.tokens) / self.refill_rate
+                print(f"LOG: Limite de ritmo da CoinGecko. Aguardando {sleep_time:.1f}s...")
+                time.sleep(sleep_time)
+                self.tokens = 1.0
+                self.last_refill = time.monotonic()
+
+            self.tokens -= 1
+
+# Plano gratuito da CoinGecko: ~10 chamadas por minuto
+coingecko_rate_limiter = TokenBucket(capacity=10, refill_rate=10 / 60)
+
 # ==========================================
 # 2. CACHE DE DADOS
 # ==========================================
 @dataclass
 class CachedData:
     data: Any
-    timestamp: float
+    timestamp: float  # time.monotonic() do momento do set (imune a ajustes do relógio)
 
 class DataCache:
     def __init__(self, default_ttl=300):
@@ -126,7 +159,7 @@ class DataCache:
         with self.lock:
             if key not in self.cache: return None
             cached = self.cache[key]
-            if time.time() - cached.timestamp > ttl:
+            if time.monotonic() - cached.timestamp > ttl:
                 del self.cache[key]
                 return None
             print(f"LOG: Cache HIT para {key_args}")
@@ -135,13 +168,44 @@ class DataCache:
     def set(self, key_args, data: Any):
         key = self._generate_key(**key_args)
         with self.lock:
-            self.cache[key] = CachedData(data=data, timestamp=time.time())
+            self.cache[key] = CachedData(data=data, timestamp=time.monotonic())
             print(f"LOG: Cache SET para {key_args}")
 
 data_cache = DataCache()
 
 # ==========================================
-# 3. VALIDAÇÃO ROBUSTA
+# 3. CLIENTES DE API POR THREAD
+# ==========================================
+_thread_local = local()
+
+def get_coingecko_client() -> CoinGeckoAPI:
+    """
+    Retorna um cliente CoinGecko exclusivo da thread atual.
+    O CoinGeckoAPI usa um requests.Session, que não é seguro para chamadas concorrentes;
+    com um cliente por thread, análises paralelas não disputam a mesma sessão.
+    """
+    client = getattr(_thread_local, 'coingecko_client', None)
+    if client is None:
+        client = CoinGeckoAPI()
+        _thread_local.coingecko_client = client
+    return client
+
+def get_binance_session() -> requests.Session:
+    """
+    Retorna uma requests.Session da thread atual para a API da Binance.
+    A sessão mantém as conexões HTTPS abertas (keep-alive) entre chamadas, evitando um
+    handshake TCP/TLS por requisição, e repete automaticamente falhas transitórias (429/5xx).
+    """
+    session = getattr(_thread_local, 'binance_session', None)
+    if session is None:
+        session = requests.Session()
+        retries = Retry(total=3, backoff_factor=0.3, status_forcelist=(429, 500, 502, 503, 504), allowed_methods=("GET",))
+        session.mount('https://', HTTPAdapter(pool_connections=4, pool_maxsize=8, max_retries=retries))
+        _thread_local.binance_session = session
+    return session
+
+# ==========================================
+# 4. VALIDAÇÃO ROBUSTA
 # ==========================================
 class DataValidator:
     @staticmethod
@@ -92,6 +92,9 @@ class DownloadProgressWindow(tk.Toplevel):
         self.center_on_parent()
 
     def update_progress(self, value, total):
+        # Chamadas ainda na fila do after() podem chegar depois que a janela foi fechada
+        if not self.winfo_exists():
+            return
         percent = int((value / total) * 100)
         self.progress['value'] = percent
         self.percent_label.config(text=f"{percent}%")
@@ -225,6 +228,7 @@ def download_and_install(root, assets):
 
             total_size = int(response.headers.get('content-length', 0))
             bytes_downloaded = 0
+            last_percent = -1
             sha256_hash = hashlib.sha256()
 
             with open(download_path, 'wb') as f:
@@ -233,22 +237,28 @@ def download_and_install(root, assets):
                     sha256_hash.update(chunk)
                     bytes_downloaded += len(chunk)
                     if total_size > 0:
-                        progress_window.update_progress(bytes_downloaded, total_size)
+                        # Só redesenha a janela quando a porcentagem muda (no máximo ~100 vezes),
+                        # e sempre pela thread do Tk em vez de a cada bloco de 8 KB.
+                        percent = int((bytes_downloaded / total_size) * 100)
+                        if percent != last_percent:
+                            last_percent = percent
+                            progress_window.after(0, progress_window.update_progress, bytes_downloaded, total_size)
 
             if expected_checksum:
                 calculated_checksum = sha256_hash.hexdigest()
                 if calculated_checksum != expected_checksum:
-                    progress_window.destroy()
+                    progress_window.after(0, progress_window.destroy)
                     os.remove(download_path)  # Limpa o arquivo corrompido
-                    messagebox.showerror("Erro de Atualização", "A verificação de integridade (checksum) falhou. O arquivo baixado pode estar corrompido ou ter sido adulterado. A atualização foi cancelada por segurança.")
+                    root.after(0, messagebox.showerror, "Erro de Atualização", "A verificação de integridade (checksum) falhou. O arquivo baixado pode estar corrompido ou ter sido adulterado. A atualização foi cancelada por segurança.")
                     return
 
-            progress_window.destroy()
+            # O Tk só pode ser manipulado pela própria thread: fechamento e diálogos vão pela fila do after()
+            progress_window.after(0, progress_window.destroy)
             root.after(0, launch_updater_and_exit, root)
 
         except Exception as e:
-            progress_window.destroy()
-            messagebox.showerror("Erro no Download", f"Falha ao baixar a atualização: {e}")
+            progress_window.after(0, progress_window.destroy)
+            root.after(0, messagebox.showerror, "Erro no Download", f"Falha ao baixar a atualização: {e}")
 
     threading.Thread(target=download_thread, daemon=True).start()
 
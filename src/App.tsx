@@ -13,6 +13,28 @@ import './components/AlertTicker.css'; // Import the new stylesheet
 import { CryptoData, Alert, MutedAlert, AlertConfigs, AlertConfig, BasicCoin, API_BASE_URL, ALERT_DEFINITIONS, DEFAULT_ALERT_CONFIG, MarketAnalysisConfig } from './types';
 import { formatTime, countActiveIndicators } from './utils';
 
+// Comparação rasa dos campos de uma moeda; usada para manter a identidade dos dados inalterados entre atualizações.
+const isSameCoinData = (a: CryptoData, b: CryptoData): boolean => {
+    const keys = Object.keys(b) as (keyof CryptoData)[];
+    return keys.length === Object.keys(a).length && keys.every(key => a[key] === b[key]);
+};
+
+// AudioContext compartilhado, criado no primeiro alerta sonoro e reutilizado pelos seguintes
+// (criar um contexto por som é caro e os navegadores limitam quantos podem existir).
+let sharedAudioContext: AudioContext | null = null;
+
+const getAudioContext = (): AudioContext | null => {
+    if (!sharedAudioContext) {
+        const AudioContextClass = window.AudioContext || (window as any).webkitAudioContext;
+        if (!AudioContextClass) return null;
+        sharedAudioContext = new AudioContextClass();
+    }
+    if (sharedAudioContext.state === 'suspended') {
+        sharedAudioContext.resume();
+    }
+    return sharedAudioContext;
+};
+
 const App = () => {
     const [cryptoData, setCryptoData] = useState<CryptoData[]>([]);
     const [allCoins, setAllCoins] = useState<BasicCoin[]>([]);
@@ -38,9 +60,10 @@ const App = () => {
     const [selectedCoin, setSelectedCoin] = useState<CryptoData | null>(null);
     const REFRESH_INTERVAL_SECONDS = 180; // 3 minutes
 
-    const handleCardClick = (coin: CryptoData) => {
+    // Estável entre renderizações para não invalidar o React.memo dos cards
+    const handleCardClick = useCallback((coin: CryptoData) => {
         setSelectedCoin(coin);
-    };
+    }, []);
 
     const handleCloseModal = () => {
         setSelectedCoin(null);
@@ -126,7 +149,9 @@ const App = () => {
                         });
                     });
                 }
-                return newAlertConfigs;
+                // Mantém a referência anterior se nada mudou: evita recriar triggerAlert e
+                // reexecutar a varredura de alertas a cada ciclo de polling
+                return JSON.stringify(newAlertConfigs) === JSON.stringify(prevAlertConfigs) ? prevAlertConfigs : newAlertConfigs;
             });
 
             const symbolsToMonitorRaw = config.cryptos_to_monitor.map((c: any) => c.symbol);
@@ -143,7 +168,12 @@ const App = () => {
 
                 setCryptoData(prevData => {
                     const prevDataMap = new Map(prevData.map(d => [d.symbol, d]));
-                    return newData.map(d => ({ ...d, lastPrice: prevDataMap.get(d.symbol)?.price ?? d.price }));
+                    return newData.map(d => {
+                        const prev = prevDataMap.get(d.symbol);
+                        const merged = { ...d, lastPrice: prev?.price ?? d.price };
+                        // Reaproveita o objeto anterior quando nada mudou, para que só os cards alterados re-renderizem
+                        return prev && isSameCoinData(prev, merged) ? prev : merged;
+                    });
                 });
                 localStorage.setItem('cryptoDataCache', JSON.stringify(newData));
                 setError(null); // Clear previous errors on success
@@ -431,10 +461,14 @@ const App = () => {
     };
 
     const sortedData = useMemo(() => {
+        // Conta os indicadores ativos uma vez por moeda, e não duas vezes a cada comparação da ordenação.
+        const activeCounts = sortKey === 'active_alerts'
+            ? new Map(cryptoData.map(coin => [coin, countActiveIndicators(coin)]))
+            : null;
         return [...cryptoData].sort((a, b) => {
-            if (sortKey === 'active_alerts') {
-                const aAlerts = countActiveIndicators(a);
-                const bAlerts = countActiveIndicators(b);
+            if (activeCounts) {
+                const aAlerts = activeCounts.get(a)!;
+                const bAlerts = activeCounts.get(b)!;
                 if (aAlerts > bAlerts) return -1;
                 if (aAlerts < bAlerts) return 1;
                 // As a secondary sort, use market cap
@@ -448,7 +482,7 @@ const App = () => {
 
     // --- Sound Synthesis Function ---
     const playSound = (type: 'golden' | 'death' | 'default') => {
-        const audioContext = new (window.AudioContext || (window as any).webkitAudioContext)();
+        const audioContext = getAudioContext();
         if (!audioContext) return;
 
         const oscillator = audioContext.createOscillator();
@@ -542,7 +576,10 @@ const App = () => {
     useEffect(() => {
         const sixtyMinutesAgo = new Date(Date.now() - 60 * 60 * 1000);
         const filtered = alerts.filter(alert => new Date(alert.timestamp) > sixtyMinutesAgo);
-        setRecentAlerts(filtered);
+        // Só troca o estado (e re-renderiza o ticker) se a lista de alertas recentes mudou de fato
+        setRecentAlerts(prev =>
+            prev.length === filtered.length && prev.every((alert, i) => alert === filtered[i]) ? prev : filtered
+        );
     }, [alerts]);
 
     return (
@@ -614,7 +651,7 @@ const App = () => {
                                         <CryptoCard
                                             key={crypto.symbol}
                                             data={crypto}
-                                            isBlinkVisible={isBlinkVisible}
+                                            isBlinkVisible={isBlinkVisible && countActiveIndicators(crypto) > 0}
                                             onClick={handleCardClick}
                                         />
                                     ))}
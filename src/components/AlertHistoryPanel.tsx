@@ -1,9 +1,12 @@
 // src/components/AlertHistoryPanel.tsx
-import React, { useState, useEffect } from 'react';
+import React, { useState, useEffect, useMemo } from 'react';
 import { Alert, API_BASE_URL } from '../types';
 import { formatDistanceToNow } from 'date-fns';
 import { ptBR } from 'date-fns/locale';
 
+// Quantidade de alertas renderizados por vez; mais itens entram conforme a rolagem se aproxima do fim
+const HISTORY_PAGE_SIZE = 200;
+
 interface AlertHistoryPanelProps {
     isOpen: boolean;
     onClose: () => void;
@@ -13,6 +16,7 @@ const AlertHistoryPanel: React.FC<AlertHistoryPanelProps> = ({ isOpen, onClose }
     const [history, setHistory] = useState<Alert[]>([]);
     const [isLoading, setIsLoading] = useState(false);
     const [error, setError] = useState<string | null>(null);
+    const [visibleCount, setVisibleCount] = useState(HISTORY_PAGE_SIZE);
 
     const fetchHistory = () => {
         setIsLoading(true);
@@ -27,6 +31,7 @@ const AlertHistoryPanel: React.FC<AlertHistoryPanelProps> = ({ isOpen, onClose }
             })
             .then((data: Alert[]) => {
                 setHistory(data);
+                setVisibleCount(HISTORY_PAGE_SIZE);
             })
             .catch(err => {
                 setError(err.message || 'Um erro desconhecido ocorreu.');
@@ -42,11 +47,32 @@ const AlertHistoryPanel: React.FC<AlertHistoryPanelProps> = ({ isOpen, onClose }
         }
     }, [isOpen]);
 
+    // Campos fixos calculados só para as linhas visíveis; o tempo relativo ("há 5 minutos")
+    // envelhece com o relógio, então é calculado na renderização
+    const historyRows = useMemo(() => history.slice(0, visibleCount).map(alert => {
+        const date = new Date(alert.timestamp);
+        return {
+            alert,
+            date,
+            fullTime: date.toLocaleString('pt-BR'),
+            price: alert.snapshot.price.toFixed(2),
+        };
+    }), [history, visibleCount]);
+
 
     if (!isOpen) {
         return null;
     }
 
+    // Renderiza a próxima página quando a rolagem passa de 80% do conteúdo já montado
+    const handleScroll = (e: React.UIEvent<HTMLDivElement>) => {
+        if (visibleCount >= history.length) return;
+        const { scrollTop, clientHeight, scrollHeight } = e.currentTarget;
+        if (scrollTop + clientHeight > scrollHeight * 0.8) {
+            setVisibleCount(count => count + HISTORY_PAGE_SIZE);
+        }
+    };
+
     const handleClearHistory = async () => {
         if (!window.confirm('Tem certeza de que deseja apagar todo o histórico de alertas? Esta ação não pode ser desfeita.')) {
             return;
@@ -82,19 +108,19 @@ const AlertHistoryPanel: React.FC<AlertHistoryPanelProps> = ({ isOpen, onClose }
         }
         return (
             <div className="alert-history-list">
-                {history.map(alert => (
+                {historyRows.map(({ alert, date, fullTime, price }) => (
                     <div key={alert.id} className="alert-history-item">
                         <div className="alert-history-header">
                             <span className="alert-history-symbol">{alert.snapshot.name}</span>
-                            <span className="alert-history-timestamp" title={new Date(alert.timestamp).toLocaleString('pt-BR')}>
-                                {formatDistanceToNow(new Date(alert.timestamp), { addSuffix: true, locale: ptBR })}
+                            <span className="alert-history-timestamp" title={fullTime}>
+                                {formatDistanceToNow(date, { addSuffix: true, locale: ptBR })}
                             </span>
                         </div>
                         <div className="alert-history-body">
                             {alert.condition}
                         </div>
                         <div className="alert-history-details">
-                            Preço no momento do alerta: $ {alert.snapshot.price.toFixed(2)}
+                            Preço no momento do alerta: $ {price}
                         </div>
                     </div>
                 ))}
@@ -109,7 +135,7 @@ const AlertHistoryPanel: React.FC<AlertHistoryPanelProps> = ({ isOpen, onClose }
                     <h2 className="modal-title">Histórico de Alertas</h2>
                     <button onClick={onClose} className="close-button" aria-label="Fechar">&times;</button>
                 </div>
-                <div className="modal-body">
+                <div className="modal-body" onScroll={handleScroll}>
                     {renderContent()}
                 </div>
                 <div className="modal-footer">
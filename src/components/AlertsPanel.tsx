@@ -1,6 +1,21 @@
 import React from 'react';
 import { Alert } from '../types';
 
+// Classe extra por tipo de gatilho, na ordem de prioridade. Montada uma única vez, fora do render.
+const ALERT_ITEM_CLASSES: ReadonlyArray<[string, string]> = [
+    ['CRUZ_DOURADA', 'alert-item alert-golden-cross'],
+    ['CRUZ_DA_MORTE', 'alert-item alert-death-cross'],
+];
+
+// The alert ID is structured as 'SYMBOL-TRIGGER_KEY-TIMESTAMP'
+// This is a reliable way to check for the trigger type without changing the Alert interface.
+const getAlertItemClass = (alert: Alert) => {
+    for (const [triggerKey, className] of ALERT_ITEM_CLASSES) {
+        if (alert.id.includes(triggerKey)) return className;
+    }
+    return 'alert-item';
+};
+
 const AlertsPanel = ({ isOpen, onClose, alerts, onClearAlerts }: {
     isOpen: boolean;
     onClose: () => void;
@@ -22,19 +37,6 @@ const AlertsPanel = ({ isOpen, onClose, alerts, onClearAlerts }: {
                         <p className="no-alerts">Nenhum alerta recente.</p>
                     ) : (
                         alerts.map(alert => {
-                            const getAlertItemClass = (alert: Alert) => {
-                                let baseClass = 'alert-item';
-                                // The alert ID is structured as 'SYMBOL-TRIGGER_KEY-TIMESTAMP'
-                                // This is a reliable way to check for the trigger type without changing the Alert interface.
-                                if (alert.id.includes('CRUZ_DOURADA')) {
-                                    return `${baseClass} alert-golden-cross`;
-                                }
-                                if (alert.id.includes('CRUZ_DA_MORTE')) {
-                                    return `${baseClass} alert-death-cross`;
-                                }
-                                return baseClass;
-                            };
-
                             return (
                                 <div key={alert.id} className={getAlertItemClass(alert)}>
                                     <div className="alert-header">
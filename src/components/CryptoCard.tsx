@@ -156,4 +156,6 @@ const CryptoCard = ({ data, isBlinkVisible, onClick }: CryptoCardProps) => {
     );
 };
 
-export default CryptoCard;
\ No newline at end of file
+// Memoizado: o App re-renderiza a cada segundo (contador) e a cada piscada; o card só re-renderiza
+// quando seus próprios dados, o estado de piscar ou o handler mudam.
+export default React.memo(CryptoCard);
\ No newline at end of file
@@ -1,4 +1,4 @@
-import React, { useState, useEffect, useCallback } from 'react';
+import React, { useState, useEffect, useCallback, useMemo } from 'react';
 import { API_BASE_URL, BasicCoin, Alert, ALERT_DEFINITIONS } from '../types';
 import ResultsTable from './ResultsTable';
 
@@ -49,19 +49,30 @@ const HistoricalAnalysisPanel: React.FC<HistoricalAnalysisPanelProps> = ({ isOpe
         if (isOpen) fetchAllCoins();
     }, [isOpen, fetchAllCoins]);
 
+    // Nome e símbolo em minúsculas calculados uma vez por lista de moedas, não a cada busca.
+    const searchableCoins = useMemo(() => allCoins.map(coin => ({
+        coin,
+        name: coin.name.toLowerCase(),
+        symbol: coin.symbol.toLowerCase(),
+    })), [allCoins]);
+
     useEffect(() => {
-        if (searchTerm.length > 1) {
-            const filtered = allCoins.filter(coin =>
-                coin.name.toLowerCase().includes(searchTerm.toLowerCase()) ||
-                coin.symbol.toLowerCase().includes(searchTerm.toLowerCase())
-            );
-            setFilteredCoins(filtered.slice(0, 100));
-            setIsCoinListVisible(true);
-        } else {
+        if (searchTerm.length <= 1) {
             setFilteredCoins([]);
             setIsCoinListVisible(false);
+            return;
         }
-    }, [searchTerm, allCoins]);
+        // Aguarda uma pausa na digitação antes de filtrar: uma rajada de teclas gera uma única filtragem.
+        const timer = setTimeout(() => {
+            const term = searchTerm.toLowerCase();
+            const filtered = searchableCoins
+                .filter(entry => entry.name.includes(term) || entry.symbol.includes(term))
+                .map(entry => entry.coin);
+            setFilteredCoins(filtered.slice(0, 100));
+            setIsCoinListVisible(true);
+        }, 150);
+        return () => clearTimeout(timer);
+    }, [searchTerm, searchableCoins]);
 
     const handleCoinSelect = (selectedCoin: BasicCoin) => {
         setSymbol(selectedCoin.symbol + 'USDT');
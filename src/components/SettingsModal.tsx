@@ -28,6 +28,8 @@ const SettingsModal = ({
 }) => {
     const [view, setView] = useState<'list' | 'add' | 'config'>('list');
     const [searchTerm, setSearchTerm] = useState('');
+    // Termo de busca aplicado à lista; só acompanha searchTerm depois de uma pausa na digitação.
+    const [debouncedSearchTerm, setDebouncedSearchTerm] = useState('');
     const [selectedCryptoSymbol, setSelectedCryptoSymbol] = useState<string | null>(null);
     const [telegramBotToken, setTelegramBotToken] = useState('');
     const [telegramChatId, setTelegramChatId] = useState('');
@@ -47,11 +49,13 @@ const SettingsModal = ({
                 });
         } else {
             // Delay resetting view state to allow for closing animation
-            setTimeout(() => {
+            const resetTimer = setTimeout(() => {
                 setView('list');
                 setSelectedCryptoSymbol(null);
                 setSearchTerm('');
             }, 300);
+            // Cancela o reset pendente se o modal for reaberto (ou desmontado) antes dele disparar
+            return () => clearTimeout(resetTimer);
         }
     }, [isOpen]);
 
@@ -90,30 +94,40 @@ const SettingsModal = ({
         }, 500); // 500ms delay
     };
 
+    useEffect(() => {
+        const timer = setTimeout(() => setDebouncedSearchTerm(searchTerm), 150);
+        return () => clearTimeout(timer);
+    }, [searchTerm]);
+
     const monitoredSymbols = useMemo(() => new Set(monitoredCoins.map(c => c.symbol)), [monitoredCoins]);
 
+    // Chaves de busca (nome/símbolo em minúsculas e par USDT) calculadas uma vez por lista de moedas,
+    // e não a cada filtragem.
+    const searchableCoins = useMemo(() => allCoins.map(crypto => ({
+        crypto,
+        name: crypto.name.toLowerCase(),
+        symbol: crypto.symbol.toLowerCase(),
+        pair: `${crypto.symbol.toUpperCase()}USDT`,
+    })), [allCoins]);
+
     const filteredAllCoins = useMemo(() => {
-        const lowercasedFilter = searchTerm.toLowerCase().trim();
+        const results: BasicCoin[] = [];
+        // A lista só é exibida na aba 'add' com o modal aberto; fora disso não há o que filtrar.
+        if (!isOpen || view !== 'add') return results;
 
-        // Filtra a lista completa de moedas para remover as que já estão sendo monitoradas.
-        const availableCoins = allCoins.filter(crypto =>
-            !monitoredSymbols.has(`${crypto.symbol.toUpperCase()}USDT`)
-        );
+        const lowercasedFilter = debouncedSearchTerm.toLowerCase().trim();
 
-        // Se o campo de busca estiver vazio, mostra as primeiras 50 moedas da lista disponível.
-        if (lowercasedFilter.length < 1) {
-            return availableCoins.slice(0, 50);
+        // Uma única passada que ignora as moedas já monitoradas, aplica o termo de busca (se houver)
+        // e para assim que encontra 50 resultados, o limite exibido para manter a UI responsiva.
+        for (const entry of searchableCoins) {
+            if (monitoredSymbols.has(entry.pair)) continue;
+            if (lowercasedFilter.length > 0 &&
+                !entry.name.includes(lowercasedFilter) && !entry.symbol.includes(lowercasedFilter)) continue;
+            results.push(entry.crypto);
+            if (results.length >= 50) break;
         }
-
-        // Se houver um termo de busca, filtra os resultados com base nesse termo.
-        const results = availableCoins.filter(crypto => {
-            return crypto.name.toLowerCase().includes(lowercasedFilter) ||
-                   crypto.symbol.toLowerCase().includes(lowercasedFilter);
-        });
-
-        // Limita o número de resultados para 50 para manter a UI responsiva.
-        return results.slice(0, 50);
-    }, [searchTerm, allCoins, monitoredSymbols]);
+        return results;
+    }, [isOpen, view, debouncedSearchTerm, searchableCoins, monitoredSymbols]);
 
     const selectedCrypto = useMemo(() => {
         if (!selectedCryptoSymbol) return null;
@@ -121,6 +135,13 @@ const SettingsModal = ({
         return monitoredCoins.find(c => c.symbol === selectedCryptoSymbol);
     }, [selectedCryptoSymbol, monitoredCoins]);
 
+    // Um único handler para todos os botões "Adicionar"; o par vem do atributo data-symbol do botão,
+    // em vez de uma closure nova por linha a cada renderização.
+    const handleAddCoinClick = (e: React.MouseEvent<HTMLButtonElement>) => {
+        const symbol = e.currentTarget.dataset.symbol;
+        if (symbol) onUpdateCoin(symbol, 'add');
+    };
+
     const handleSelectCrypto = (symbol: string) => {
         setSelectedCryptoSymbol(symbol);
         setView('config');
@@ -272,15 +293,16 @@ const SettingsModal = ({
                                         <span>{crypto.name} <span className="crypto-symbol-light">({crypto.symbol.toUpperCase()})</span></span>
                                         <button
                                             className="button button-add"
-                                            onClick={() => onUpdateCoin(`${crypto.symbol.toUpperCase()}USDT`, 'add')}
+                                            data-symbol={`${crypto.symbol.toUpperCase()}USDT`}
+                                            onClick={handleAddCoinClick}
                                         >
                                             Adicionar
                                         </button>
                                     </div>
                                 ))
                             ) : (
-                                searchTerm.trim().length > 0
-                                    ? <p className="no-results-message">Nenhuma criptomoeda encontrada para "{searchTerm}".</p>
+                                debouncedSearchTerm.trim().length > 0
+                                    ? <p className="no-results-message">Nenhuma criptomoeda encontrada para "{debouncedSearchTerm}".</p>
                                     : <p className="no-results-message">Digite para buscar uma moeda.</p>
                             )}
                         </div>
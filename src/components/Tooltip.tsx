@@ -1,9 +1,10 @@
 import React from 'react';
 
+// O texto é exposto via data-tooltip e desenhado pelo pseudo-elemento .tooltip::after (ver index.css),
+// evitando um <span> extra por tooltip em cada card.
 const Tooltip = ({ text, children }: { text: string; children: React.ReactNode }) => (
-    <div className="tooltip">
+    <div className="tooltip" data-tooltip={text}>
         {children}
-        <span className="tooltiptext">{text}</span>
     </div>
 );
 